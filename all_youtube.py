@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import logging
+import os
 import re
+import threading
+import time
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
+import orjson
+import requests
 import scrapetube
+import scrapetube.scrapetube as scrapetube_core
 
 from process import (
+    copy_input_file,
+    ensure_dir,
     now_iso,
     parse_cookies_from_browser,
     process_urls_batch,
@@ -20,6 +32,8 @@ from process import (
     write_jsonl,
 )
 
+log = logging.getLogger(__name__)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -45,7 +59,10 @@ def parse_args() -> argparse.Namespace:
         "--channel-workers",
         type=int,
         default=0,
-        help="Parallel channel expansion workers. 0 means auto.",
+        help=(
+            "Parallel channel expansion workers. Expansion is network-bound, so this can safely "
+            "exceed the CPU count. 0 means auto (4x CPU cores, capped at 64)."
+        ),
     )
     parser.add_argument(
         "--max-videos-per-channel",
@@ -59,6 +76,18 @@ def parse_args() -> argparse.Namespace:
         choices=["newest", "oldest", "popular"],
         help="Video ordering when fetching channel videos. Default: newest",
     )
+    parser.add_argument(
+        "--channel-page-sleep",
+        type=float,
+        default=1.0,
+        help="Seconds to wait between channel listing pages (rate-limit guard). Default: 1.0",
+    )
+    parser.add_argument(
+        "--channel-cache-ttl-hours",
+        type=float,
+        default=6.0,
+        help="Reuse a channel's cached video list if it is younger than this. 0 disables the cache. Default: 6",
+    )
     parser.add_argument(
         "--auto-language",
         default=None,
@@ -77,7 +106,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--audio-format",
         default="mp3",
-        help="Audio codec extension for FFmpegExtractAudio. Default: mp3",
+        help=(
+            "Audio codec extension for FFmpegExtractAudio. opus, m4a and best keep YouTube's "
+            "audio stream without re-encoding; mp3, wav and flac always re-encode. Default: mp3"
+        ),
     )
     parser.add_argument(
         "--audio-quality",
@@ -98,13 +130,19 @@ def parse_args() -> argparse.Namespace:
         "--video-workers",
         type=int,
         default=0,
-        help="Parallel video workers. 0 means auto (use all CPU cores).",
+        help="Parallel video workers. 0 means auto (4x CPU cores, capped at 32).",
     )
     parser.add_argument(
         "--ffmpeg-bin",
         default="ffmpeg",
         help="ffmpeg binary path/name. Default: ffmpeg",
     )
+    parser.add_argument(
+        "--log-level",
+        choices=["debug", "info", "warning", "error"],
+        default="info",
+        help="Progress log verbosity on stderr. Use warning to silence per-channel lines. Default: info",
+    )
     return parser.parse_args()
 
 
@@ -112,19 +150,15 @@ def load_channels_file(path: Path) -> list[str]:
     if not path.exists():
         raise FileNotFoundError(f"Channel file not found: {path}")
 
-    lines = path.read_text(encoding="utf-8").splitlines()
-    refs = [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
-    seen = set()
-    unique_refs: list[str] = []
-    for ref in refs:
-        if ref not in seen:
-            seen.add(ref)
-            unique_refs.append(ref)
-    return unique_refs
+    stripped = (line.strip() for line in path.read_text(encoding="utf-8").splitlines())
+    return list(dict.fromkeys(ref for ref in stripped if ref and not ref.startswith("#")))
+
+
+_SLUG_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
 
 
 def slugify(value: str) -> str:
-    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", value.strip().strip("/"))
+    slug = _SLUG_UNSAFE_RE.sub("-", value.strip().strip("/"))
     return slug.strip("-") or "channel"
 
 
@@ -133,56 +167,150 @@ def channel_slug(channel_ref: str, index: int) -> str:
 
 
 def resolve_channel_kwargs(channel_ref: str) -> dict[str, Any]:
-    if channel_ref.startswith("http://") or channel_ref.startswith("https://"):
-        return {"channel_url": channel_ref}
-    if channel_ref.startswith("@"):
+    # The reference kinds have disjoint first characters, so dispatch on that first.
+    first = channel_ref[:1]
+    if first == "@":
         return {"channel_url": f"https://www.youtube.com/{channel_ref}"}
-    if channel_ref.startswith("UC"):
+    if first == "h" and channel_ref.startswith(("http://", "https://")):
+        return {"channel_url": channel_ref}
+    if first == "U" and channel_ref.startswith("UC"):
         return {"channel_id": channel_ref}
     return {"channel_username": channel_ref}
 
 
-def fetch_channel_video_urls(
+WATCH_URL_PREFIX = "https://www.youtube.com/watch?v="
+
+
+def watch_url(video_id: str) -> str:
+    return WATCH_URL_PREFIX + video_id
+
+
+class _KeepAliveSession(requests.Session):
+    """Session that survives scrapetube's per-channel close() so TLS connections are reused."""
+
+    def close(self) -> None:
+        pass
+
+
+_SCRAPE_STATE = threading.local()
+_scrapetube_get_session = scrapetube_core.get_session
+
+
+def _pooled_scrape_session(proxies: dict[str, str] | None = None) -> requests.Session:
+    if proxies:
+        return _scrapetube_get_session(proxies)
+    session = getattr(_SCRAPE_STATE, "session", None)
+    if session is None:
+        session = _KeepAliveSession()
+        session.headers.update(_scrapetube_get_session().headers)
+        _SCRAPE_STATE.session = session
+    return session
+
+
+def use_pooled_scrape_sessions() -> None:
+    """
+    Make scrapetube reuse one keep-alive session per worker thread.
+
+    scrapetube opens (and closes) a new requests.Session for every channel, which
+    costs a fresh TCP+TLS handshake per channel. requests.Session is not shared
+    across threads, so each channel worker keeps its own.
+    """
+    scrapetube_core.get_session = _pooled_scrape_session
+
+
+def fetch_channel_video_ids(
     channel_ref: str,
     *,
     limit: int | None,
     sort_by: str,
+    page_sleep: float = 1.0,
+    output_file: Path | None = None,
 ) -> tuple[list[str], dict[str, Any]]:
+    """
+    Return unique video ids for a channel.
+
+    When output_file is given, watch URLs are streamed to it (one per line) while
+    the channel is being paged, and the file is only published once paging finishes.
+    """
     kwargs = resolve_channel_kwargs(channel_ref)
     videos = scrapetube.get_channel(
         limit=limit,
+        sleep=page_sleep,
         sort_by=sort_by,  # type: ignore[arg-type]
         content_type="videos",
         **kwargs,
     )
 
-    urls: list[str] = []
-    for video in videos:
-        video_id = video.get("videoId")
-        if video_id:
-            urls.append(f"https://www.youtube.com/watch?v={video_id}")
-
-    deduped_urls: list[str] = []
+    video_ids: list[str] = []
     seen = set()
-    for url in urls:
-        if url not in seen:
-            seen.add(url)
-            deduped_urls.append(url)
+    partial_file = output_file.with_name(f"{output_file.name}.part") if output_file else None
+    try:
+        with partial_file.open("w", encoding="utf-8", buffering=65536) if partial_file else nullcontext() as out:
+            for video in videos:
+                video_id = video.get("videoId")
+                if not video_id:
+                    continue
+                if video_id not in seen:
+                    seen.add(video_id)
+                    video_ids.append(video_id)
+                    if out is not None:
+                        out.write(f"{WATCH_URL_PREFIX}{video_id}\n")
+        if partial_file is not None:
+            os.replace(partial_file, output_file)
+    except BaseException:
+        if partial_file is not None:
+            partial_file.unlink(missing_ok=True)
+        raise
+
+    meta = {"source_ref": channel_ref, "resolver": kwargs, "video_count": len(video_ids)}
+    return video_ids, meta
+
+
+def channel_cache_path(cache_dir: Path, channel_ref: str, *, sort_by: str, limit: int | None) -> Path:
+    key = hashlib.sha256(f"{channel_ref}|{sort_by}|{limit}".encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.json"
+
+
+def read_channel_cache(path: Path, *, ttl_seconds: float) -> tuple[list[str], dict[str, Any], str] | None:
+    if ttl_seconds <= 0:
+        return None
+    try:
+        if time.time() - path.stat().st_mtime > ttl_seconds:
+            return None
+        payload = orjson.loads(path.read_bytes())
+        return payload["video_ids"], payload["meta"], payload["fetched_at"]
+    except (OSError, KeyError, TypeError, orjson.JSONDecodeError):
+        return None
+
 
-    meta = {"source_ref": channel_ref, "resolver": kwargs, "video_count": len(deduped_urls)}
-    return deduped_urls, meta
+def write_channel_cache(path: Path, video_ids: list[str], meta: dict[str, Any], *, fetched_at: str) -> None:
+    partial_path = path.with_name(f"{path.name}.part")
+    partial_path.write_bytes(orjson.dumps({"video_ids": video_ids, "meta": meta, "fetched_at": fetched_at}))
+    os.replace(partial_path, path)
 
 
-def write_json(path: Path, data: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+def write_json(path: Path, data: dict[str, Any]) -> bytes:
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    path.write_bytes(payload)
+    return payload
+
+
+def write_watch_urls(path: Path, video_ids: Iterable[str]) -> None:
+    with path.open("w", encoding="utf-8", buffering=65536) as f:
+        f.writelines(f"{WATCH_URL_PREFIX}{video_id}\n" for video_id in video_ids)
+
+
+def configure_logging(level: str) -> None:
+    logging.basicConfig(level=getattr(logging, level.upper()), format="%(message)s")
 
 
 def main() -> None:
     args = parse_args()
+    configure_logging(args.log_level)
     dataset_root = Path(args.dataset_root).resolve()
     channels_file = Path(args.channels_file).resolve()
     channel_refs = load_channels_file(channels_file)
+    use_pooled_scrape_sessions()
     cookie_file = resolve_cookie_file(args.cookies)
     cookies_from_browser = parse_cookies_from_browser(args.cookies_from_browser)
     runtime = resolve_runtime(
@@ -192,7 +320,13 @@ def main() -> None:
 
     if args.channel_workers < 0:
         raise ValueError("--channel-workers must be >= 0.")
-    channel_workers = args.channel_workers if args.channel_workers > 0 else runtime["video_workers"]
+    if args.channel_page_sleep < 0:
+        raise ValueError("--channel-page-sleep must be >= 0.")
+    if args.channel_cache_ttl_hours < 0:
+        raise ValueError("--channel-cache-ttl-hours must be >= 0.")
+    channel_cache_ttl_seconds = args.channel_cache_ttl_hours * 3600
+    # Channel expansion is pure network I/O, so it is sized independently of video workers.
+    channel_workers = args.channel_workers if args.channel_workers > 0 else min(64, 4 * runtime["cpu_count"])
     channel_workers = max(1, channel_workers)
 
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -200,18 +334,19 @@ def main() -> None:
     manifests_dir = dataset_root / "manifests"
     channels_dir = dataset_root / "channels"
     videos_dir = dataset_root / "videos"
-    links_dir.mkdir(parents=True, exist_ok=True)
-    manifests_dir.mkdir(parents=True, exist_ok=True)
-    channels_dir.mkdir(parents=True, exist_ok=True)
-    videos_dir.mkdir(parents=True, exist_ok=True)
+    channel_cache_dir = dataset_root / ".cache" / "channels"
+    for directory in (links_dir, manifests_dir, channels_dir, videos_dir, channel_cache_dir):
+        ensure_dir(directory)
 
     if args.system != "auto" and runtime["system"] != runtime["detected_system"]:
-        print(
-            f"Runtime system override active: selected={runtime['system']} detected={runtime['detected_system']}"
+        log.warning(
+            "Runtime system override active: selected=%s detected=%s",
+            runtime["system"],
+            runtime["detected_system"],
         )
 
-    print(
-        "Runtime config:",
+    log.info(
+        "Runtime config: %s",
         json.dumps(
             {
                 "system": runtime["system"],
@@ -226,29 +361,50 @@ def main() -> None:
         ),
     )
 
-    (links_dir / f"channel_input_{run_id}.txt").write_text("\n".join(channel_refs) + "\n", encoding="utf-8")
+    copy_input_file(channels_file, links_dir, f"channel_input_{run_id}")
+
+    # Create every channel directory up front so workers never touch mkdir.
+    channel_slugs = [channel_slug(ref, idx + 1) for idx, ref in enumerate(channel_refs)]
+    channels_dir_str = str(channels_dir)
+    for slug in channel_slugs:
+        os.makedirs(os.path.join(channels_dir_str, slug), exist_ok=True)
 
     channel_rows: list[dict[str, Any] | None] = [None] * len(channel_refs)
-    channel_urls_by_index: list[list[str] | None] = [None] * len(channel_refs)
+    channel_video_ids_by_index: list[list[str] | None] = [None] * len(channel_refs)
 
     def expand_channel(index: int, channel_ref: str) -> tuple[int, dict[str, Any], list[str]]:
-        slug = channel_slug(channel_ref, index + 1)
+        slug = channel_slugs[index]
         channel_root = channels_dir / slug
-        channel_root.mkdir(parents=True, exist_ok=True)
+        videos_file = channel_root / "videos.txt"
+        cache_path = channel_cache_path(
+            channel_cache_dir,
+            channel_ref,
+            sort_by=args.sort_by,
+            limit=args.max_videos_per_channel,
+        )
         try:
-            urls, channel_meta = fetch_channel_video_urls(
-                channel_ref,
-                limit=args.max_videos_per_channel,
-                sort_by=args.sort_by,
-            )
-            videos_file = channel_root / "videos.txt"
-            videos_file.write_text("\n".join(urls) + ("\n" if urls else ""), encoding="utf-8")
+            cached = read_channel_cache(cache_path, ttl_seconds=channel_cache_ttl_seconds)
+            if cached is not None:
+                video_ids, channel_meta, fetched_at = cached
+                write_watch_urls(videos_file, video_ids)
+            else:
+                video_ids, channel_meta = fetch_channel_video_ids(
+                    channel_ref,
+                    limit=args.max_videos_per_channel,
+                    sort_by=args.sort_by,
+                    page_sleep=args.channel_page_sleep,
+                    output_file=videos_file,
+                )
+                fetched_at = now_iso()
+                if channel_cache_ttl_seconds > 0:
+                    write_channel_cache(cache_path, video_ids, channel_meta, fetched_at=fetched_at)
             write_json(
                 channel_root / "metadata.json",
                 {
                     **channel_meta,
                     "channel_slug": slug,
-                    "fetched_at": now_iso(),
+                    "fetched_at": fetched_at,
+                    "from_cache": cached is not None,
                     "videos_file": str(videos_file.resolve()),
                 },
             )
@@ -256,10 +412,10 @@ def main() -> None:
                 "channel_ref": channel_ref,
                 "channel_slug": slug,
                 "status": "success",
-                "video_count": len(urls),
+                "video_count": len(video_ids),
                 "error": None,
             }
-            return index, row, urls
+            return index, row, video_ids
         except Exception as exc:  # noqa: BLE001
             write_json(
                 channel_root / "metadata.json",
@@ -282,10 +438,17 @@ def main() -> None:
 
     if channel_workers <= 1:
         for idx, ref in enumerate(channel_refs):
-            out_idx, row, urls = expand_channel(idx, ref)
+            out_idx, row, video_ids = expand_channel(idx, ref)
             channel_rows[out_idx] = row
-            channel_urls_by_index[out_idx] = urls
-            print(f"[channel {out_idx + 1}/{len(channel_refs)}] {ref} -> {row['status']} ({len(urls)} videos)")
+            channel_video_ids_by_index[out_idx] = video_ids
+            log.info(
+                "[channel %d/%d] %s -> %s (%d videos)",
+                out_idx + 1,
+                len(channel_refs),
+                ref,
+                row["status"],
+                len(video_ids),
+            )
     else:
         with ThreadPoolExecutor(max_workers=channel_workers) as executor:
             futures = {
@@ -296,21 +459,25 @@ def main() -> None:
             for future in as_completed(futures):
                 idx, ref = futures[future]
                 completed += 1
-                out_idx, row, urls = future.result()
+                out_idx, row, video_ids = future.result()
                 channel_rows[out_idx] = row
-                channel_urls_by_index[out_idx] = urls
-                print(f"[channel {completed}/{len(channel_refs)}] {ref} -> {row['status']} ({len(urls)} videos)")
-
-    all_urls: list[str] = []
-    seen_urls = set()
-    for urls in channel_urls_by_index:
-        for url in (urls or []):
-            if url not in seen_urls:
-                seen_urls.add(url)
-                all_urls.append(url)
+                channel_video_ids_by_index[out_idx] = video_ids
+                log.info(
+                    "[channel %d/%d] %s -> %s (%d videos)",
+                    completed,
+                    len(channel_refs),
+                    ref,
+                    row["status"],
+                    len(video_ids),
+                )
+
+    all_video_ids = dict.fromkeys(
+        video_id for video_ids in channel_video_ids_by_index for video_id in (video_ids or [])
+    )
+    all_urls = [watch_url(video_id) for video_id in all_video_ids]
 
     expanded_links_path = links_dir / f"channel_video_urls_{run_id}.txt"
-    expanded_links_path.write_text("\n".join(all_urls) + ("\n" if all_urls else ""), encoding="utf-8")
+    write_watch_urls(expanded_links_path, all_video_ids)
 
     records = process_urls_batch(
         all_urls,
@@ -333,12 +500,19 @@ def main() -> None:
     video_csv_path = manifests_dir / "channel_records.csv"
     summary_path = manifests_dir / "channel_summary.json"
 
-    failed_video_rows = [row for row in records if row.get("status") in {"failed", "partial"}]
-    success_count = len([row for row in records if row.get("status") == "success"])
-    partial_count = len([row for row in records if row.get("status") == "partial"])
-    failed_count = len([row for row in records if row.get("status") == "failed"])
+    failed_video_rows: list[dict[str, Any]] = []
+    status_counts: Counter[str] = Counter()
+    for row in records:
+        status = row.get("status")
+        status_counts[status] += 1
+        if status in {"failed", "partial"}:
+            failed_video_rows.append(row)
+    success_count = status_counts["success"]
+    partial_count = status_counts["partial"]
+    failed_count = status_counts["failed"]
 
     normalized_channel_rows = [row for row in channel_rows if row is not None]
+    channel_status_counts = Counter(row["status"] for row in normalized_channel_rows)
     write_jsonl(channel_records_path, normalized_channel_rows)
     write_jsonl(video_records_path, records)
     write_jsonl(video_failures_path, failed_video_rows)
@@ -356,8 +530,8 @@ def main() -> None:
         "cookie_file_provided": bool(cookie_file),
         "cookies_from_browser_provided": bool(cookies_from_browser),
         "channels_total": len(channel_refs),
-        "channels_succeeded": len([row for row in normalized_channel_rows if row["status"] == "success"]),
-        "channels_failed": len([row for row in normalized_channel_rows if row["status"] == "failed"]),
+        "channels_succeeded": channel_status_counts["success"],
+        "channels_failed": channel_status_counts["failed"],
         "videos_total": len(all_urls),
         "videos_success": success_count,
         "videos_partial": partial_count,
@@ -368,10 +542,11 @@ def main() -> None:
         "video_failures_path": str(video_failures_path),
         "video_csv_path": str(video_csv_path),
     }
-    write_json(summary_path, summary)
+    summary_bytes = write_json(summary_path, summary)
 
+    # The summary is the run's result, not progress: always print it to stdout.
     print("\nRun complete")
-    print(json.dumps(summary, indent=2))
+    print(summary_bytes.decode("utf-8"))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import atexit
 import os
+import queue
+import random
+import re
+import sqlite3
 import tempfile
-from contextlib import contextmanager
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import partial
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, NoReturn
 
+import orjson
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError
 
@@ -36,38 +47,190 @@ def _default_youtube_extractor_args() -> dict[str, Any]:
     }
 
 
+def _record_final_path(path: str) -> None:
+    # post_hooks run on the thread that called download(), which owns the YoutubeDL.
+    _THREAD_STATE.final_paths.append(path)
+
+
+_STATIC_BASE_OPTS = MappingProxyType(
+    {
+        "quiet": True,
+        "no_warnings": True,
+        "noplaylist": True,
+        "extractor_retries": 5,
+        "js_runtimes": MappingProxyType({"node": MappingProxyType({})}),
+        "http_headers": MappingProxyType(
+            {
+                "User-Agent": (
+                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/124.0.0.0 Safari/537.36"
+                )
+            }
+        ),
+    }
+)
+_STATIC_INFO_OPTS = MappingProxyType({**_STATIC_BASE_OPTS, "extract_flat": False, "retries": 5})
+_STATIC_DOWNLOAD_OPTS = MappingProxyType(
+    {
+        **_STATIC_BASE_OPTS,
+        # yt-dlp reports the post-processed file through post_hooks, which avoids
+        # scanning output_dir to find out which extension it ended up with.
+        "post_hooks": (_record_final_path,),
+        "retries": 8,
+        "fragment_retries": 8,
+    }
+)
+# Try the preferred player clients first, then yt-dlp's defaults.
+_INFO_STRATEGY_OPTS = (
+    MappingProxyType({**_STATIC_INFO_OPTS, "extractor_args": _default_youtube_extractor_args()}),
+    _STATIC_INFO_OPTS,
+)
+_DOWNLOAD_STRATEGY_OPTS = (
+    MappingProxyType({**_STATIC_DOWNLOAD_OPTS, "extractor_args": _default_youtube_extractor_args()}),
+    _STATIC_DOWNLOAD_OPTS,
+)
+_DOWNLOAD_FORMAT_ATTEMPTS: tuple[str | None, ...] = (
+    "bestaudio[acodec!=none]/bestaudio*/bestaudio/best*[acodec!=none]/best",
+    "bestaudio*/bestaudio/best",
+    "best",
+    None,
+)
+
+
+_FORMAT_UNAVAILABLE_RE = re.compile(r"requested format (?:is )?not available", re.IGNORECASE)
+_BOT_CHECK_RE = re.compile(r"Sign in to confirm you[’']re not a bot")
+
+
 def _format_unavailable_error(error: Exception) -> bool:
-    message = str(error).lower()
-    return "requested format is not available" in message or "requested format not available" in message
+    return _FORMAT_UNAVAILABLE_RE.search(str(error)) is not None
+
+
+def _is_bot_check(message: str) -> bool:
+    return _BOT_CHECK_RE.search(message) is not None
+
+
+# Source streams FFmpegExtractAudio can stream-copy (no re-encode) for a target codec.
+_STREAM_COPY_FORMATS = {
+    "opus": "bestaudio[acodec=opus]",
+    "m4a": "bestaudio[acodec^=mp4a]",
+    "aac": "bestaudio[acodec^=mp4a]",
+}
+
+
+def _set_format(ydl: YoutubeDL, fmt: str | None) -> None:
+    # YoutubeDL compiles its format selector at construction, so update both.
+    if fmt is None:
+        ydl.params.pop("format", None)
+        ydl.format_selector = None
+    else:
+        ydl.params["format"] = fmt
+        ydl.format_selector = ydl.build_format_selector(fmt)
+
+
+def _set_output(ydl: YoutubeDL, output_dir: Path, *, overwrite: bool) -> None:
+    # Per-call settings on a cached YoutubeDL; outtmpl is normalized to a dict at construction.
+    ydl.params["outtmpl"]["default"] = str(output_dir / "source.%(ext)s")
+    ydl.params["overwrites"] = overwrite
+    ydl.params["nooverwrites"] = not overwrite
+
+
+# Matched against the domain field in place (pos/endpos), so no slice or lowercase copy is made.
+_ALLOWED_COOKIE_DOMAIN_RE = re.compile(
+    rb"(?:^|\.)(?:youtube|google|googlevideo|ytimg)\.com$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SANITIZED_COOKIE_HEADER = b"# Netscape HTTP Cookie File\n# Sanitized for yt-dlp session\n\n"
 
 
 def _sanitize_cookie_file_text(raw: bytes) -> str:
     # Accept imperfect transfers and normalize into Netscape-like lines.
-    text = raw.decode("utf-8", errors="ignore").replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n")
-    allowed_domains = ("youtube.com", "google.com", "googlevideo.com", "ytimg.com")
-    sanitized: list[str] = []
-
-    for line in text.split("\n"):
-        if not line:
-            continue
-        if line.startswith("#"):
-            sanitized.append(line)
-            continue
-
-        parts = line.split("\t")
-        if len(parts) < 7:
-            continue
-
-        domain = parts[0].lstrip(".").lower()
-        if not any(domain.endswith(suffix) for suffix in allowed_domains):
-            continue
-        sanitized.append("\t".join(parts[:7]))
-
-    if not sanitized:
+    if b"\x00" in raw:
+        raw = raw.replace(b"\x00", b"")
+    if b"\r" in raw:
+        raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    sanitized = bytearray(_SANITIZED_COOKIE_HEADER)
+    header_size = len(sanitized)
+
+    pos = 0
+    size = len(raw)
+    while pos < size:
+        end = raw.find(b"\n", pos)
+        if end < 0:
+            end = size
+        if end > pos:
+            if raw[pos] == 0x23:  # "#"
+                sanitized += raw[pos : end + 1] if end < size else raw[pos:end] + b"\n"
+            else:
+                # Keep the first 7 tab-separated fields: the line up to its 7th tab.
+                first_tab = raw.find(b"\t", pos, end)
+                tab = first_tab
+                for _ in range(5):
+                    if tab < 0:
+                        break
+                    tab = raw.find(b"\t", tab + 1, end)
+                if tab >= 0 and _ALLOWED_COOKIE_DOMAIN_RE.search(raw, pos, first_tab):
+                    seventh_tab = raw.find(b"\t", tab + 1, end)
+                    sanitized += raw[pos : seventh_tab if seventh_tab >= 0 else end]
+                    sanitized += b"\n"
+        pos = end + 1
+
+    if len(sanitized) == header_size:
         raise RuntimeError("No valid YouTube/Google cookies found in cookie file.")
 
-    header = ["# Netscape HTTP Cookie File", "# Sanitized for yt-dlp session", ""]
-    return "\n".join(header + sanitized) + "\n"
+    return sanitized.decode("utf-8", errors="ignore")
+
+
+_COOKIE_SNAPSHOTS: dict[tuple[str, int, int], bytes] = {}
+_COOKIE_SNAPSHOTS_LOCK = threading.Lock()
+
+
+def _cookie_snapshot(cookie_file: str) -> bytes:
+    """Sanitize a cookie file once per version (mtime + size); later sessions reuse the in-memory copy."""
+    try:
+        stat = os.stat(cookie_file)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Cookie file not found: {Path(cookie_file)}") from None
+    key = (cookie_file, stat.st_mtime_ns, stat.st_size)
+    with _COOKIE_SNAPSHOTS_LOCK:
+        snapshot = _COOKIE_SNAPSHOTS.get(key)
+        if snapshot is None:
+            snapshot = _sanitize_cookie_file_text(Path(cookie_file).read_bytes()).encode("utf-8")
+            # Drop snapshots of older versions of the same file.
+            for stale_key in [k for k in _COOKIE_SNAPSHOTS if k[0] == cookie_file]:
+                del _COOKIE_SNAPSHOTS[stale_key]
+            _COOKIE_SNAPSHOTS[key] = snapshot
+    return snapshot
+
+
+# Keep session cookie files in RAM (tmpfs) where available; mkstemp already creates them 0600.
+_COOKIE_FILE_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+_COOKIE_FILE_POOL: queue.SimpleQueue[str] = queue.SimpleQueue()
+_POOLED_COOKIE_FILES: list[str] = []
+_POOLED_COOKIE_FILES_LOCK = threading.Lock()
+
+
+def _acquire_cookie_file() -> str:
+    try:
+        return _COOKIE_FILE_POOL.get_nowait()
+    except queue.Empty:
+        pass
+    fd, temp_path = tempfile.mkstemp(prefix="yt_cookies_", suffix=".txt", dir=_COOKIE_FILE_DIR)
+    os.close(fd)
+    with _POOLED_COOKIE_FILES_LOCK:
+        _POOLED_COOKIE_FILES.append(temp_path)
+    return temp_path
+
+
+def _remove_pooled_cookie_files() -> None:
+    with _POOLED_COOKIE_FILES_LOCK:
+        paths = list(_POOLED_COOKIE_FILES)
+        _POOLED_COOKIE_FILES.clear()
+    for temp_path in paths:
+        try:
+            Path(temp_path).unlink(missing_ok=True)
+        except Exception:
+            pass
 
 
 @contextmanager
@@ -77,32 +240,104 @@ def _session_cookie_file(cookie_file: str | None):
 
     yt-dlp may update/dump cookies to cookiefile. With concurrent workers, sharing
     one cookie file can corrupt it. This avoids cross-worker writes.
+
+    Files come from a process-wide pool: a session overwrites a free file with the
+    sanitized snapshot and hands it back afterwards, so large runs do not create
+    and unlink a temp file per session. The pool is removed at exit.
     """
     if not cookie_file:
         yield None
         return
 
-    source = Path(cookie_file)
-    if not source.exists():
-        raise FileNotFoundError(f"Cookie file not found: {source}")
-
-    fd, temp_path = tempfile.mkstemp(prefix="yt_cookies_", suffix=".txt")
-    os.close(fd)
+    snapshot = _cookie_snapshot(cookie_file)
+    temp_path = _acquire_cookie_file()
     try:
-        raw = source.read_bytes()
-        sanitized = _sanitize_cookie_file_text(raw)
-        Path(temp_path).write_text(sanitized, encoding="utf-8")
+        with open(temp_path, "wb") as f:
+            f.write(snapshot)
         yield temp_path
     finally:
-        try:
-            Path(temp_path).unlink(missing_ok=True)
-        except Exception:
-            pass
+        _COOKIE_FILE_POOL.put(temp_path)
+
 
+_THREAD_STATE = threading.local()
+# Thread ident -> (that thread's cached YoutubeDLs, their exit stacks), so sessions
+# can be closed per owning thread without touching other batches' live sessions.
+_OPEN_SESSIONS: dict[int, tuple[dict[tuple[Any, ...], YoutubeDL], list[ExitStack]]] = {}
+_OPEN_SESSIONS_LOCK = threading.Lock()
 
-def _raise_with_auth_hint(error: Exception) -> None:
+
+def _cached_ydl(
+    key: tuple[Any, ...],
+    opts: Mapping[str, Any],
+    *,
+    cookie_file: str | None,
+    cookies_from_browser: tuple[str, str | None, str | None, str | None] | None,
+) -> YoutubeDL:
+    """
+    Return a YoutubeDL owned by the current thread, built once per key.
+
+    YoutubeDL is not safe to share across threads, so every worker thread keeps
+    its own instances, each with its own isolated cookie file, and reuses them
+    across URLs instead of re-initializing extractors for every call.
+    """
+    ydls = getattr(_THREAD_STATE, "ydls", None)
+    if ydls is None:
+        ydls = _THREAD_STATE.ydls = {}
+    ydl = ydls.get(key)
+    if ydl is not None:
+        return ydl
+
+    stack = ExitStack()
+    try:
+        isolated_cookie_file = stack.enter_context(_session_cookie_file(cookie_file))
+        params = {
+            **opts,
+            **_auth_opts(cookie_file=isolated_cookie_file, cookies_from_browser=cookies_from_browser),
+        }
+        if "js_runtimes" in params:
+            # YoutubeDL requires (and may prune) a real dict of dicts here.
+            params["js_runtimes"] = {name: dict(config) for name, config in params["js_runtimes"].items()}
+        ydl = stack.enter_context(YoutubeDL(params))
+    except BaseException:
+        stack.close()
+        raise
+    with _OPEN_SESSIONS_LOCK:
+        # A reused ident may still hold stacks of a dead thread; keep them for closing.
+        _, stacks = _OPEN_SESSIONS.get(threading.get_ident(), (None, []))
+        stacks.append(stack)
+        _OPEN_SESSIONS[threading.get_ident()] = (ydls, stacks)
+    ydls[key] = ydl
+    return ydl
+
+
+def close_cached_sessions(thread_idents: Iterable[int] | None = None) -> None:
+    """
+    Close cached YoutubeDLs and remove their isolated cookie files.
+
+    With thread_idents, only sessions owned by those threads are closed; they must
+    not be in use. Without it every session is closed, so that form is only safe
+    when no batch is running (e.g. at exit).
+    """
+    with _OPEN_SESSIONS_LOCK:
+        idents = list(_OPEN_SESSIONS) if thread_idents is None else [i for i in thread_idents if i in _OPEN_SESSIONS]
+        owned = [_OPEN_SESSIONS.pop(ident) for ident in idents]
+    for ydls, stacks in owned:
+        # The dict is the owning thread's cache, so it rebuilds sessions on next use.
+        ydls.clear()
+        for stack in stacks:
+            try:
+                stack.close()
+            except Exception:
+                pass
+
+
+atexit.register(_remove_pooled_cookie_files)
+atexit.register(close_cached_sessions)
+
+
+def _raise_with_auth_hint(error: Exception) -> NoReturn:
     message = str(error)
-    if "Sign in to confirm you’re not a bot" in message or "Sign in to confirm you're not a bot" in message:
+    if _is_bot_check(message):
         raise RuntimeError(
             "YouTube requested bot verification. Re-run with --cookies <cookies.txt> or "
             "--cookies-from-browser <browser-spec>, e.g. --cookies-from-browser firefox:default-release."
@@ -110,55 +345,103 @@ def _raise_with_auth_hint(error: Exception) -> None:
     raise error
 
 
+_VIDEO_ID_RE = re.compile(r"(?:[?&]v=|/shorts/|/embed/|/live/|youtu\.be/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])")
+
+
+def video_id_from_url(url: str) -> str | None:
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def _info_cache_connection(cache_path: Path) -> sqlite3.Connection:
+    """Return this thread's connection to a video-info cache database."""
+    connections = getattr(_THREAD_STATE, "info_cache", None)
+    if connections is None:
+        connections = _THREAD_STATE.info_cache = {}
+    key = str(cache_path)
+    connection = connections.get(key)
+    if connection is None:
+        connection = sqlite3.connect(key, timeout=30, isolation_level=None)
+        # WAL lets concurrent workers and processes read while one of them writes.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS video_info "
+            "(video_id TEXT PRIMARY KEY, fetched_at REAL NOT NULL, info BLOB NOT NULL)"
+        )
+        connections[key] = connection
+    return connection
+
+
+def _read_cached_info(cache_path: Path, video_id: str, ttl_seconds: float) -> dict[str, Any] | None:
+    if ttl_seconds <= 0:
+        return None
+    try:
+        row = _info_cache_connection(cache_path).execute(
+            "SELECT info FROM video_info WHERE video_id = ? AND fetched_at >= ?",
+            (video_id, time.time() - ttl_seconds),
+        ).fetchone()
+        return orjson.loads(row[0]) if row else None
+    except (sqlite3.Error, orjson.JSONDecodeError):
+        return None
+
+
+def _write_cached_info(cache_path: Path, video_id: str, info: dict[str, Any]) -> None:
+    try:
+        blob = orjson.dumps(YoutubeDL.sanitize_info(info), option=orjson.OPT_NON_STR_KEYS)
+        _info_cache_connection(cache_path).execute(
+            "INSERT OR REPLACE INTO video_info (video_id, fetched_at, info) VALUES (?, ?, ?)",
+            (video_id, time.time(), blob),
+        )
+    except (sqlite3.Error, TypeError):
+        # The cache is an optimization; a failed write must not fail the fetch.
+        pass
+
+
 def fetch_video_info(
     url: str,
     *,
     cookie_file: str | None = None,
     cookies_from_browser: tuple[str, str | None, str | None, str | None] | None = None,
+    info_cache_path: Path | None = None,
+    info_cache_ttl: float = 24 * 3600,
 ) -> dict[str, Any]:
-    """Return normalized metadata for a single video URL."""
+    """
+    Return normalized metadata for a single video URL.
+
+    With info_cache_path, metadata is cached in a SQLite database keyed by video id
+    and reused for info_cache_ttl seconds (0 always re-fetches but still refreshes
+    the cache).
+    """
+    video_id = video_id_from_url(url) if info_cache_path is not None else None
+    if video_id is not None:
+        cached = _read_cached_info(info_cache_path, video_id, info_cache_ttl)
+        if cached is not None:
+            return cached
+
     try:
-        with _session_cookie_file(cookie_file) as isolated_cookie_file:
-            base_opts = {
-                "quiet": True,
-                "no_warnings": True,
-                "noplaylist": True,
-                "extract_flat": False,
-                "extractor_retries": 5,
-                "retries": 5,
-                "js_runtimes": {"node": {}},
-                "http_headers": {
-                    "User-Agent": (
-                        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/124.0.0.0 Safari/537.36"
-                    )
-                },
-                **_auth_opts(cookie_file=isolated_cookie_file, cookies_from_browser=cookies_from_browser),
-            }
-            strategy_opts = (
-                {**base_opts, "extractor_args": _default_youtube_extractor_args()},
-                base_opts,
-            )
-            info: dict[str, Any] | None = None
-            last_error: Exception | None = None
-            for opts in strategy_opts:
-                try:
-                    with YoutubeDL(opts) as ydl:
-                        info = ydl.extract_info(url, download=False)
-                    break
-                except DownloadError as exc:
-                    last_error = exc
-                    message = str(exc)
-                    if "Sign in to confirm you’re not a bot" in message or "Sign in to confirm you're not a bot" in message:
-                        _raise_with_auth_hint(exc)
-                    continue
-                except Exception as exc:  # noqa: BLE001
-                    # Retry once with default extractor behavior, then fail.
-                    last_error = exc
-                    continue
-            if info is None and last_error is not None:
-                _raise_with_auth_hint(last_error)
+        info: dict[str, Any] | None = None
+        last_error: Exception | None = None
+        for strategy_index, opts in enumerate(_INFO_STRATEGY_OPTS):
+            try:
+                ydl = _cached_ydl(
+                    ("info", strategy_index, cookie_file, cookies_from_browser),
+                    opts,
+                    cookie_file=cookie_file,
+                    cookies_from_browser=cookies_from_browser,
+                )
+                info = ydl.extract_info(url, download=False)
+                break
+            except DownloadError as exc:
+                last_error = exc
+                if _is_bot_check(str(exc)):
+                    _raise_with_auth_hint(exc)
+                continue
+            except Exception as exc:  # noqa: BLE001
+                # Retry once with default extractor behavior, then fail.
+                last_error = exc
+                continue
+        if info is None and last_error is not None:
+            _raise_with_auth_hint(last_error)
     except DownloadError as exc:
         _raise_with_auth_hint(exc)
     except Exception as exc:  # noqa: BLE001
@@ -172,9 +455,134 @@ def fetch_video_info(
 
     if not isinstance(info, dict) or not info.get("id"):
         raise RuntimeError(f"Could not resolve video metadata for URL: {url}")
+    if video_id is not None and info["id"] == video_id:
+        _write_cached_info(info_cache_path, video_id, info)
     return info
 
 
+_DONE_MARKER = ".done"
+
+
+def _downloaded_file(output_dir: Path, target_path: Path, final_paths: list[str]) -> Path | None:
+    if final_paths and Path(final_paths[-1]).is_file():
+        return Path(final_paths[-1])
+    if target_path.exists():
+        return target_path
+    return min((path for path in output_dir.glob("source.*") if path.is_file()), default=None)
+
+
+def _non_empty_file(path: Path) -> bool:
+    try:
+        return path.stat().st_size > 0
+    except OSError:
+        return False
+
+
+def _completed_download(output_dir: Path, marker_key: str) -> Path | None:
+    """
+    Return the file recorded by a previous successful download_audio call.
+
+    The marker stores the (url, format, quality) request next to the produced file
+    name, so re-runs skip yt-dlp entirely, including for formats whose output
+    extension differs from the requested one. Zero-byte files from interrupted
+    runs are not trusted.
+    """
+    try:
+        marker_text = (output_dir / _DONE_MARKER).read_text(encoding="utf-8")
+        recorded_key, _, filename = marker_text.rstrip("\n").rpartition("\t")
+    except OSError:
+        return None
+    if recorded_key != marker_key or not filename:
+        return None
+    path = output_dir / filename
+    return path if _non_empty_file(path) else None
+
+
+def _mark_download_done(output_dir: Path, marker_key: str, path: Path) -> None:
+    (output_dir / _DONE_MARKER).write_text(f"{marker_key}\t{path.name}\n", encoding="utf-8")
+
+
+def make_fetcher(
+    *,
+    cookie_file: str | None = None,
+    cookies_from_browser: tuple[str, str | None, str | None, str | None] | None = None,
+    info_cache_path: Path | None = None,
+    info_cache_ttl: float = 24 * 3600,
+) -> Callable[[str], dict[str, Any]]:
+    """Return fetch_video_info with auth and cache settings bound, for callers looping over URLs."""
+    return partial(
+        fetch_video_info,
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+        info_cache_path=info_cache_path,
+        info_cache_ttl=info_cache_ttl,
+    )
+
+
+def make_downloader(
+    *,
+    cookie_file: str | None = None,
+    cookies_from_browser: tuple[str, str | None, str | None, str | None] | None = None,
+    audio_format: str = "mp3",
+    audio_quality: str = "192",
+    ffmpeg_bin: str = "ffmpeg",
+    overwrite: bool = False,
+) -> Callable[[str, Path], Path]:
+    """Return download_audio with auth and output settings bound, called as downloader(url, output_dir)."""
+    return partial(
+        download_audio,
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+        audio_format=audio_format,
+        audio_quality=audio_quality,
+        ffmpeg_bin=ffmpeg_bin,
+        overwrite=overwrite,
+    )
+
+
+def fetch_video_info_many(
+    urls: list[str],
+    *,
+    cookie_file: str | None = None,
+    cookies_from_browser: tuple[str, str | None, str | None, str | None] | None = None,
+    info_cache_path: Path | None = None,
+    max_workers: int = 8,
+    jitter: tuple[float, float] = (0.2, 0.8),
+) -> list[dict[str, Any] | Exception]:
+    """
+    Fetch metadata for many URLs in parallel, preserving input order.
+
+    Each worker thread keeps its own cached YoutubeDL and isolated cookie file.
+    A random delay before every request avoids perfectly regular request intervals.
+    Failures are returned in place of the info dict instead of aborting the batch.
+    """
+
+    fetch = make_fetcher(
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+        info_cache_path=info_cache_path,
+    )
+
+    def fetch_one(url: str) -> dict[str, Any] | Exception:
+        if jitter[1] > 0:
+            time.sleep(random.uniform(*jitter))
+        try:
+            return fetch(url)
+        except Exception as exc:  # noqa: BLE001
+            return exc
+
+    # Only this call's own worker threads are torn down afterwards; sessions of any
+    # concurrently running batch stay open.
+    worker_idents: list[int] = []
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max(1, max_workers), initializer=lambda: worker_idents.append(threading.get_ident())
+        ) as executor:
+            return list(executor.map(fetch_one, urls))
+    finally:
+        close_cached_sessions(worker_idents)
+
+
 def download_audio(
     url: str,
     output_dir: Path,
@@ -187,86 +595,162 @@ def download_audio(
     overwrite: bool = False,
 ) -> Path:
     """Download best audio and convert to the requested format."""
+    _, path = _download_audio(
+        url,
+        output_dir,
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+        audio_format=audio_format,
+        audio_quality=audio_quality,
+        ffmpeg_bin=ffmpeg_bin,
+        overwrite=overwrite,
+        with_info=False,
+    )
+    return path
+
+
+def fetch_and_download(
+    url: str,
+    output_dir: Path,
+    *,
+    cookie_file: str | None = None,
+    cookies_from_browser: tuple[str, str | None, str | None, str | None] | None = None,
+    audio_format: str = "mp3",
+    audio_quality: str = "192",
+    ffmpeg_bin: str = "ffmpeg",
+    overwrite: bool = False,
+    info_cache_path: Path | None = None,
+) -> tuple[dict[str, Any], Path]:
+    """
+    Download audio and return it together with the video metadata.
+
+    Uses a single extract_info(download=True) pass, so the player response is
+    extracted once instead of once for fetch_video_info and again for download_audio.
+    """
+    info, path = _download_audio(
+        url,
+        output_dir,
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+        audio_format=audio_format,
+        audio_quality=audio_quality,
+        ffmpeg_bin=ffmpeg_bin,
+        overwrite=overwrite,
+        with_info=True,
+    )
+    if info is None:
+        # The download was already done; metadata comes from the cache or a plain extract.
+        info = fetch_video_info(
+            url,
+            cookie_file=cookie_file,
+            cookies_from_browser=cookies_from_browser,
+            info_cache_path=info_cache_path,
+        )
+        return info, path
+
+    # If a playlist-like URL is passed, use the first resolved entry.
+    if info.get("entries"):
+        entries = [entry for entry in info["entries"] if entry]
+        if entries:
+            info = entries[0]
+    if not info.get("id"):
+        raise RuntimeError(f"Could not resolve video metadata for URL: {url}")
+    if info_cache_path is not None and video_id_from_url(url) == info["id"]:
+        _write_cached_info(info_cache_path, info["id"], info)
+    return info, path
+
+
+def _download_audio(
+    url: str,
+    output_dir: Path,
+    *,
+    cookie_file: str | None,
+    cookies_from_browser: tuple[str, str | None, str | None, str | None] | None,
+    audio_format: str,
+    audio_quality: str,
+    ffmpeg_bin: str,
+    overwrite: bool,
+    with_info: bool,
+) -> tuple[dict[str, Any] | None, Path]:
     output_dir.mkdir(parents=True, exist_ok=True)
     target_path = output_dir / f"source.{audio_format}"
 
-    if target_path.exists() and not overwrite:
-        return target_path
+    marker_key = f"{url}\t{audio_format}\t{audio_quality}"
+    if not overwrite:
+        done_path = _completed_download(output_dir, marker_key)
+        if done_path is not None:
+            return None, done_path
+        if _non_empty_file(target_path):
+            return None, target_path
 
+    final_paths = _THREAD_STATE.final_paths = []
     try:
-        with _session_cookie_file(cookie_file) as isolated_cookie_file:
-            base_opts = {
-                "outtmpl": str(output_dir / "source.%(ext)s"),
-                "noplaylist": True,
-                "quiet": True,
-                "no_warnings": True,
-                "overwrites": overwrite,
-                "retries": 8,
-                "fragment_retries": 8,
-                "extractor_retries": 5,
-                "js_runtimes": {"node": {}},
-                "http_headers": {
-                    "User-Agent": (
-                        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/124.0.0.0 Safari/537.36"
-                    )
-                },
-                **_auth_opts(cookie_file=isolated_cookie_file, cookies_from_browser=cookies_from_browser),
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": audio_format,
-                        "preferredquality": audio_quality,
-                    }
-                ],
-            }
-            if ffmpeg_bin and ffmpeg_bin != "ffmpeg":
-                base_opts["ffmpeg_location"] = ffmpeg_bin
-
-            format_attempts: tuple[str | None, ...] = (
-                "bestaudio[acodec!=none]/bestaudio*/bestaudio/best*[acodec!=none]/best",
-                "bestaudio*/bestaudio/best",
-                "best",
-                None,
+        call_opts: dict[str, Any] = {
+            "outtmpl": str(output_dir / "source.%(ext)s"),
+            "overwrites": overwrite,
+            "postprocessors": [
+                {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": audio_format,
+                    "preferredquality": audio_quality,
+                }
+            ],
+        }
+        if ffmpeg_bin and ffmpeg_bin != "ffmpeg":
+            call_opts["ffmpeg_location"] = ffmpeg_bin
+
+        format_attempts = _DOWNLOAD_FORMAT_ATTEMPTS
+        copy_format = _STREAM_COPY_FORMATS.get(audio_format.lower())
+        if copy_format:
+            format_attempts = (copy_format, *format_attempts)
+        sessions = tuple(
+            (
+                (
+                    "download",
+                    strategy_index,
+                    cookie_file,
+                    cookies_from_browser,
+                    audio_format,
+                    audio_quality,
+                    ffmpeg_bin,
+                ),
+                {**opts, **call_opts},
             )
-            strategy_opts = (
-                {**base_opts, "extractor_args": _default_youtube_extractor_args()},
-                base_opts,
+            for strategy_index, opts in enumerate(_DOWNLOAD_STRATEGY_OPTS)
+        )
+        # Every (strategy, format) pair in order; only "format unavailable" moves on to the next one.
+        attempts = tuple((session, fmt) for session in sessions for fmt in format_attempts)
+
+        last_error: Exception | None = None
+        for (session_key, session_opts), fmt in attempts:
+            ydl = _cached_ydl(
+                session_key,
+                session_opts,
+                cookie_file=cookie_file,
+                cookies_from_browser=cookies_from_browser,
             )
-            last_error: Exception | None = None
-            finished = False
-            for base in strategy_opts:
-                for fmt in format_attempts:
-                    try:
-                        opts = dict(base)
-                        if fmt is not None:
-                            opts["format"] = fmt
-                        with YoutubeDL(opts) as ydl:
-                            ydl.download([url])
-                        last_error = None
-                        finished = True
-                        break
-                    except DownloadError as exc:
-                        last_error = exc
-                        if _format_unavailable_error(exc):
-                            continue
-                        _raise_with_auth_hint(exc)
-                if finished:
-                    break
-
-            if last_error is not None:
-                _raise_with_auth_hint(last_error)
+            _set_output(ydl, output_dir, overwrite=overwrite)
+            _set_format(ydl, fmt)
+            info: dict[str, Any] | None = None
+            try:
+                if with_info:
+                    info = ydl.extract_info(url, download=True)
+                else:
+                    ydl.download([url])
+            except DownloadError as exc:
+                if not _format_unavailable_error(exc):
+                    _raise_with_auth_hint(exc)
+                last_error = exc
+                continue
+
+            result_path = _downloaded_file(output_dir, target_path, final_paths)
+            if result_path is None:
+                raise RuntimeError(f"Audio download did not produce a file for URL: {url}")
+            _mark_download_done(output_dir, marker_key, result_path)
+            return info, result_path
+
+        raise last_error or RuntimeError(f"Audio download did not produce a file for URL: {url}")
     except DownloadError as exc:
         _raise_with_auth_hint(exc)
     except Exception as exc:  # noqa: BLE001
         _raise_with_auth_hint(exc)
-
-    if target_path.exists():
-        return target_path
-
-    candidates = [path for path in output_dir.glob("source.*") if path.is_file()]
-    if candidates:
-        return sorted(candidates)[0]
-
-    raise RuntimeError(f"Audio download did not produce a file for URL: {url}")
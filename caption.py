@@ -1,24 +1,61 @@
 from __future__ import annotations
 
-import json
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
+import orjson
+import requests
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import NoTranscriptFound
 
 
-def _write_transcript_file(path: Path, raw_entries: list[dict[str, Any]]) -> None:
+def _is_normalized(raw_entries: list[dict[str, Any]]) -> bool:
+    # to_raw_data() entries all share one shape, so the first entry speaks for the list.
+    if not raw_entries:
+        return True
+    first = raw_entries[0]
+    return type(first.get("start")) is float and type(first.get("duration")) is float
+
+
+def _transcript_json(raw_entries: list[dict[str, Any]]) -> bytes:
+    if not _is_normalized(raw_entries):
+        for entry in raw_entries:
+            if type(entry.get("start")) is not float:
+                entry["start"] = float(entry.get("start", 0.0))
+            if type(entry.get("duration")) is not float:
+                entry["duration"] = float(entry.get("duration", 0.0))
+    return orjson.dumps(raw_entries, option=orjson.OPT_INDENT_2)
+
+
+def _write_transcript_file(path: Path, payload: bytes) -> None:
+    # Publish atomically so an existing file is always complete and can be trusted on re-runs.
+    # The temp name is per thread: two URL spellings of one video can be written concurrently.
     path.parent.mkdir(parents=True, exist_ok=True)
-    entries = [
-        {
-            "text": entry.get("text", ""),
-            "start": float(entry.get("start", 0.0)),
-            "duration": float(entry.get("duration", 0.0)),
-        }
-        for entry in raw_entries
-    ]
-    path.write_text(json.dumps(entries, ensure_ascii=False, indent=2), encoding="utf-8")
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+_THREAD_STATE = threading.local()
+
+
+def _transcript_api() -> YouTubeTranscriptApi:
+    """
+    Return a YouTubeTranscriptApi owned by the current thread.
+
+    The library is not thread-safe, so each worker gets its own instance; its
+    requests.Session keeps timedtext connections alive across that thread's videos.
+    """
+    api = getattr(_THREAD_STATE, "api", None)
+    if api is None:
+        api = _THREAD_STATE.api = YouTubeTranscriptApi(http_client=requests.Session())
+    return api
 
 
 def _first_available_transcript(transcripts: list[Any]) -> Any | None:
@@ -26,7 +63,11 @@ def _first_available_transcript(transcripts: list[Any]) -> Any | None:
     return manual[0] if manual else (transcripts[0] if transcripts else None)
 
 
-def _resolve_target_auto_transcript(transcript_list: Any, language_code: str) -> tuple[Any | None, str]:
+def _resolve_target_auto_transcript(
+    transcript_list: Any,
+    all_transcripts: list[Any],
+    language_code: str,
+) -> tuple[Any | None, str]:
     try:
         return transcript_list.find_generated_transcript([language_code]), "generated"
     except NoTranscriptFound:
@@ -37,7 +78,7 @@ def _resolve_target_auto_transcript(transcript_list: Any, language_code: str) ->
     except NoTranscriptFound:
         pass
 
-    for transcript in transcript_list:
+    for transcript in all_transcripts:
         if transcript.is_translatable:
             return transcript.translate(language_code), "translated"
 
@@ -69,8 +110,7 @@ def fetch_and_store_transcripts(
     - auto/<language_code>.json (optional)
     """
     transcripts_root.mkdir(parents=True, exist_ok=True)
-    ytt_api = YouTubeTranscriptApi()
-    transcript_list = ytt_api.list(video_id)
+    transcript_list = _transcript_api().list(video_id)
     all_transcripts = list(transcript_list)
 
     summary: dict[str, Any] = {
@@ -81,19 +121,29 @@ def fetch_and_store_transcripts(
         "available": [],
     }
 
+    # default.json / auto_*.json usually duplicate one of the per-language files, so
+    # each transcript is fetched and serialized once and the bytes are reused.
+    payloads: dict[Any, bytes] = {}
+
+    def store(transcript: Any, path: Path) -> None:
+        payload = payloads.get(transcript)
+        if payload is None:
+            payload = payloads[transcript] = _transcript_json(transcript.fetch().to_raw_data())
+        _write_transcript_file(path, payload)
+
     default_transcript = _first_available_transcript(all_transcripts)
     default_path = transcripts_root / "default.json"
     if default_transcript:
         if overwrite or not default_path.exists():
-            _write_transcript_file(default_path, default_transcript.fetch().to_raw_data())
+            store(default_transcript, default_path)
         summary["default_path"] = str(default_path)
 
     if auto_language:
-        target_transcript, mode = _resolve_target_auto_transcript(transcript_list, auto_language)
+        target_transcript, mode = _resolve_target_auto_transcript(transcript_list, all_transcripts, auto_language)
         if target_transcript:
             target_path = transcripts_root / f"auto_{auto_language}.json"
             if overwrite or not target_path.exists():
-                _write_transcript_file(target_path, target_transcript.fetch().to_raw_data())
+                store(target_transcript, target_path)
             summary["auto_language_path"] = str(target_path)
             summary["auto_language_mode"] = mode
             summary["auto_language_code"] = auto_language
@@ -105,7 +155,7 @@ def fetch_and_store_transcripts(
         if detected_transcript and code:
             target_path = transcripts_root / f"auto_detected_{code}.json"
             if overwrite or not target_path.exists():
-                _write_transcript_file(target_path, detected_transcript.fetch().to_raw_data())
+                store(detected_transcript, target_path)
             summary["auto_language_path"] = str(target_path)
             summary["auto_language_mode"] = mode
             summary["auto_language_code"] = code
@@ -113,12 +163,14 @@ def fetch_and_store_transcripts(
             summary["auto_language_mode"] = "missing"
 
     if include_all_transcripts:
+        # youtube_transcript_api is not thread-safe, so languages are fetched one at a time
+        # on this thread; its keep-alive session still saves a handshake per request.
         for transcript in all_transcripts:
             kind = "auto" if transcript.is_generated else "manual"
             filename = f"{transcript.language_code}.json"
             path = transcripts_root / kind / filename
             if overwrite or not path.exists():
-                _write_transcript_file(path, transcript.fetch().to_raw_data())
+                store(transcript, path)
 
             summary["available"].append(
                 {
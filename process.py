@@ -4,14 +4,27 @@ import argparse
 import csv
 import json
 import os
-import platform
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import shutil
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
-
-from audio import download_audio, fetch_video_info
+from typing import Any, Callable
+
+import orjson
+
+from audio import (
+    close_cached_sessions,
+    fetch_and_download,
+    fetch_video_info,
+    make_downloader,
+    make_fetcher,
+    video_id_from_url,
+)
 from caption import fetch_and_store_transcripts
 
 
@@ -53,7 +66,10 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--audio-format",
         default="mp3",
-        help="Audio codec extension for FFmpegExtractAudio. Default: mp3",
+        help=(
+            "Audio codec extension for FFmpegExtractAudio. opus, m4a and best keep YouTube's "
+            "audio stream without re-encoding; mp3, wav and flac always re-encode. Default: mp3"
+        ),
     )
     parser.add_argument(
         "--audio-quality",
@@ -74,7 +90,7 @@ def parse_args() -> argparse.Namespace:
         "--video-workers",
         type=int,
         default=0,
-        help="Parallel video workers. 0 means auto (use all CPU cores).",
+        help="Parallel video workers. 0 means auto (4x CPU cores, capped at 32).",
     )
     parser.add_argument(
         "--ffmpeg-bin",
@@ -91,35 +107,28 @@ def load_urls(path: Path) -> list[str]:
     if path.suffix.lower() == ".json":
         data = json.loads(path.read_text(encoding="utf-8"))
         if isinstance(data, list):
-            urls = [str(item).strip() for item in data]
+            items = data
         elif isinstance(data, dict) and isinstance(data.get("urls"), list):
-            urls = [str(item).strip() for item in data["urls"]]
+            items = data["urls"]
         else:
             raise ValueError("JSON URLs file must be a list or {\"urls\": [...]} object.")
+        urls = (str(item).strip() for item in items)
     else:
-        lines = path.read_text(encoding="utf-8").splitlines()
-        urls = [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+        stripped = (line.strip() for line in path.read_text(encoding="utf-8").splitlines())
+        urls = (line for line in stripped if line and not line.startswith("#"))
 
-    unique_urls: list[str] = []
-    seen = set()
-    for url in urls:
-        if url not in seen:
-            seen.add(url)
-            unique_urls.append(url)
-    return unique_urls
+    # dict.fromkeys dedupes in C while keeping first-seen order.
+    return list(dict.fromkeys(urls))
 
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@lru_cache(maxsize=1)
 def detect_current_system() -> str:
-    current = platform.system().lower()
-    if current == "darwin":
-        return "mac"
-    if current == "linux":
-        return "linux"
-    return "linux"
+    # Anything that is not macOS gets the Linux profile.
+    return "mac" if sys.platform == "darwin" else "linux"
 
 
 def resolve_runtime(
@@ -134,7 +143,9 @@ def resolve_runtime(
     if video_workers_arg < 0:
         raise ValueError("Worker counts must be >= 0.")
 
-    video_workers = video_workers_arg if video_workers_arg > 0 else max(1, cpu_count)
+    # Video work is mostly waiting on YouTube and on ffmpeg subprocesses, not on
+    # in-process CPU, so oversubscribe cores (ThreadPoolExecutor's I/O heuristic).
+    video_workers = video_workers_arg if video_workers_arg > 0 else min(32, cpu_count * 4)
 
     return {
         "cpu_count": cpu_count,
@@ -144,13 +155,15 @@ def resolve_runtime(
     }
 
 
+_COOKIES_FROM_BROWSER_RE = re.compile(
+    r"(?x)(?P<name>[^+:]+)(?:\s*\+\s*(?P<keyring>[^:]+))?(?:\s*:\s*(?!:)(?P<profile>.+?))?(?:\s*::\s*(?P<container>.+))?"
+)
+
+
 def parse_cookies_from_browser(value: str | None) -> tuple[str, str | None, str | None, str | None] | None:
     if not value:
         return None
-    match = re.fullmatch(
-        r"(?x)(?P<name>[^+:]+)(?:\s*\+\s*(?P<keyring>[^:]+))?(?:\s*:\s*(?!:)(?P<profile>.+?))?(?:\s*::\s*(?P<container>.+))?",
-        value,
-    )
+    match = _COOKIES_FROM_BROWSER_RE.fullmatch(value)
     if match is None:
         raise ValueError(f"Invalid --cookies-from-browser format: {value}")
 
@@ -160,7 +173,9 @@ def parse_cookies_from_browser(value: str | None) -> tuple[str, str | None, str
     return browser_name, profile, keyring, container
 
 
+@lru_cache(maxsize=4)
 def resolve_cookie_file(path_value: str | None) -> str | None:
+    """Resolve --cookies once to an absolute path string; callers pass that string on to the workers."""
     if not path_value:
         return None
     cookie_path = Path(path_value).expanduser().resolve()
@@ -170,31 +185,100 @@ def resolve_cookie_file(path_value: str | None) -> str | None:
 
 
 def to_relative(path: str | Path | None, root: Path) -> str | None:
+    """Return path relative to root; root must already be resolved (callers resolve dataset_root once)."""
     if path is None:
         return None
-    return str(Path(path).resolve().relative_to(root.resolve()))
+    # Output paths are built from the resolved root, so a prefix strip avoids the
+    # readlink/stat chain of resolve(); anything else takes the exact slow path.
+    path_str = os.fspath(path)
+    root_prefix = os.path.join(root, "")
+    if path_str.startswith(root_prefix) and f"{os.sep}..{os.sep}" not in path_str:
+        return path_str[len(root_prefix) :]
+    return str(Path(path).resolve().relative_to(root))
+
+
+@lru_cache(maxsize=32)
+def _ensure_dir(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+
+def ensure_dir(path: Path) -> None:
+    """
+    mkdir -p for the fixed dataset skeleton (links/, manifests/, ...), memoized per directory.
+
+    The memo does not notice deleted directories, so per-video and per-batch setup
+    directories use a plain mkdir instead.
+    """
+    _ensure_dir(str(path))
 
 
 def write_jsonl(path: Path, rows: list[dict[str, Any]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+    ensure_dir(path.parent)
+    with path.open("wb") as f:
         for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.write(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS))
+
+
+def copy_input_file(src: Path, dst_dir: Path, stem: str) -> Path:
+    """Snapshot src as dst_dir/<stem><src suffix> with a byte copy (no decode or re-join) and return the path."""
+    # A real copy, not a hard link: later in-place edits of the input must not rewrite old run records.
+    dst = dst_dir / f"{stem}{src.suffix or '.txt'}"
+    ensure_dir(dst_dir)
+    shutil.copyfile(src, dst)
+    return dst
+
+
+# Every record process_url() returns uses (a subset of) these keys, so the CSV header is fixed and stable.
+_RECORD_FIELDS = (
+    "url",
+    "status",
+    "video_id",
+    "title",
+    "duration_seconds",
+    "audio_path",
+    "default_transcript_path",
+    "auto_language",
+    "auto_transcript_path",
+    "auto_transcript_mode",
+    "segment_count",
+    "segments_index_path",
+    "metadata_path",
+    "error",
+    "started_at",
+    "finished_at",
+)
 
 
 def write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(path.parent)
     if not rows:
         path.write_text("", encoding="utf-8")
         return
 
-    fieldnames = sorted({key for row in rows for key in row.keys()})
     with path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=_RECORD_FIELDS, extrasaction="ignore")
         writer.writeheader()
         writer.writerows(rows)
 
 
+def write_csv_from_jsonl(path: Path, jsonl_path: Path) -> None:
+    """Write a CSV equivalent to write_csv() from a JSONL file, streaming it instead of loading it."""
+    ensure_dir(path.parent)
+    with jsonl_path.open("rb") as src, path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_RECORD_FIELDS, extrasaction="ignore")
+        for index, line in enumerate(src):
+            if index == 0:
+                writer.writeheader()
+            writer.writerow(orjson.loads(line))
+
+
+VIDEO_INFO_CACHE_TTL_SECONDS = 24 * 3600
+
+
+def video_info_cache_path(dataset_root: Path) -> Path:
+    return dataset_root / ".cache" / "video_info.sqlite3"
+
+
 def process_urls_batch(
     urls: list[str],
     dataset_root: Path,
@@ -209,12 +293,46 @@ def process_urls_batch(
     ffmpeg_bin: str,
     video_workers: int,
     label: str = "video",
+    on_record: Callable[[dict[str, Any]], None] | None = None,
 ) -> list[dict[str, Any]]:
+    """
+    Process urls and return their records in input order.
+
+    With on_record, each record is handed to the callback as soon as it finishes
+    (in completion order, on the calling thread) and is not retained; the return
+    value is then empty.
+    """
     if not urls:
         return []
 
+    dataset_root = dataset_root.resolve()
     records: list[dict[str, Any] | None] = [None] * len(urls)
 
+    def collect(idx: int, record: dict[str, Any]) -> None:
+        if on_record is not None:
+            on_record(record)
+        else:
+            records[idx] = record
+
+    info_cache_path = video_info_cache_path(dataset_root)
+    info_cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Bind the per-run settings once; the yt-dlp sessions behind them are cached per
+    # worker thread in audio.py and reused across every URL of the batch.
+    fetcher = make_fetcher(
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+        info_cache_path=info_cache_path,
+        info_cache_ttl=0 if overwrite else VIDEO_INFO_CACHE_TTL_SECONDS,
+    )
+    downloader = make_downloader(
+        cookie_file=cookie_file,
+        cookies_from_browser=cookies_from_browser,
+        audio_format=audio_format,
+        audio_quality=audio_quality,
+        ffmpeg_bin=ffmpeg_bin,
+        overwrite=overwrite,
+    )
+
     def status_suffix(record: dict[str, Any]) -> str:
         status = str(record.get("status", "unknown"))
         error = str(record.get("error") or "").strip()
@@ -225,8 +343,37 @@ def process_urls_batch(
             compact_error = compact_error[:177] + "..."
         return f"{status} ({compact_error})"
 
+    # Metadata for upcoming URLs is fetched ahead of the workers so extraction
+    # overlaps with audio downloads already in flight.
+    prefetch_depth = 2 * max(1, video_workers)
+    info_futures: dict[int, Future[dict[str, Any] | None]] = {}
+    prefetch_lock = threading.Lock()
+    next_prefetch = 0
+
+    def prefetch_info(url: str) -> dict[str, Any] | None:
+        # Videos finished by an earlier run are short-circuited in process_url; no fetch needed.
+        if not overwrite and load_completed_metadata(
+            url,
+            dataset_root,
+            auto_language=auto_language,
+            audio_format=audio_format,
+            include_all_transcripts=include_all_transcripts,
+        ):
+            return None
+        return fetcher(url)
+
+    def schedule_prefetch(executor: ThreadPoolExecutor, upto: int) -> None:
+        nonlocal next_prefetch
+        with prefetch_lock:
+            while next_prefetch < min(upto, len(urls)):
+                info_futures[next_prefetch] = executor.submit(prefetch_info, urls[next_prefetch])
+                next_prefetch += 1
+
     def run_single(idx: int, url: str) -> tuple[int, dict[str, Any]]:
         try:
+            schedule_prefetch(prefetch_executor, idx + 1 + prefetch_depth)
+            with prefetch_lock:
+                info_future = info_futures.pop(idx)
             record = process_url(
                 url,
                 dataset_root,
@@ -238,6 +385,9 @@ def process_urls_batch(
                 include_all_transcripts=include_all_transcripts,
                 overwrite=overwrite,
                 ffmpeg_bin=ffmpeg_bin,
+                info=info_future.result(),
+                downloader=downloader,
+                transcript_executor=transcript_executor,
             )
         except Exception as exc:  # noqa: BLE001
             record = {
@@ -249,25 +399,122 @@ def process_urls_batch(
             }
         return idx, record
 
-    if video_workers <= 1:
-        for index, url in enumerate(urls):
-            idx, record = run_single(index, url)
-            records[idx] = record
-            print(f"[{label} {idx + 1}/{len(urls)}] {url} -> {status_suffix(record)}")
-    else:
-        with ThreadPoolExecutor(max_workers=video_workers) as executor:
-            futures = {executor.submit(run_single, idx, url): (idx, url) for idx, url in enumerate(urls)}
-            completed = 0
-            for future in as_completed(futures):
-                idx, url = futures[future]
-                completed += 1
-                out_idx, record = future.result()
-                records[out_idx] = record
-                print(f"[{label} {completed}/{len(urls)}] {url} -> {status_suffix(record)}")
+    # yt-dlp sessions are cached per thread; at the end only the threads this batch
+    # ran on are torn down, never those of another batch running concurrently.
+    session_idents: list[int] = []
+
+    def track_session_thread() -> None:
+        session_idents.append(threading.get_ident())
+
+    try:
+        # Transcripts only need the video id, so they get their own pool and are fetched
+        # while the worker that submitted them is still downloading the audio.
+        with ThreadPoolExecutor(
+            max_workers=max(1, video_workers), initializer=track_session_thread
+        ) as prefetch_executor, ThreadPoolExecutor(max_workers=max(1, video_workers)) as transcript_executor:
+            if video_workers <= 1:
+                track_session_thread()
+                for index, url in enumerate(urls):
+                    idx, record = run_single(index, url)
+                    collect(idx, record)
+                    print(f"[{label} {idx + 1}/{len(urls)}] {url} -> {status_suffix(record)}")
+            else:
+                # Keep only a bounded window of URLs in flight instead of queueing a
+                # future per URL up front, so huge batches hold O(workers) pending work.
+                max_in_flight = 2 * video_workers
+                pending_urls = iter(enumerate(urls))
+                with ThreadPoolExecutor(max_workers=video_workers, initializer=track_session_thread) as executor:
+                    futures: dict[Future[tuple[int, dict[str, Any]]], str] = {}
+
+                    def submit_next() -> None:
+                        for idx, url in pending_urls:
+                            futures[executor.submit(run_single, idx, url)] = url
+                            if len(futures) >= max_in_flight:
+                                return
+
+                    submit_next()
+                    completed = 0
+                    while futures:
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            url = futures.pop(future)
+                            completed += 1
+                            out_idx, record = future.result()
+                            collect(out_idx, record)
+                            print(f"[{label} {completed}/{len(urls)}] {url} -> {status_suffix(record)}")
+                        submit_next()
+    finally:
+        close_cached_sessions(session_idents)
 
     return [record for record in records if record is not None]
 
 
+def load_completed_metadata(
+    url: str,
+    dataset_root: Path,
+    *,
+    auto_language: str | None,
+    audio_format: str,
+    include_all_transcripts: bool,
+) -> tuple[dict[str, Any], Path] | None:
+    """
+    Return (metadata, metadata_path) when a previous run fully processed url.
+
+    Only the video id in the URL is needed, so re-runs skip metadata extraction,
+    download and transcripts with a single stat + read. Partial results (transcript
+    errors), a different auto language or audio format, and missing audio are
+    processed again, as are runs made with a different transcript selection (a forced
+    vs detected auto language, or without the per-language dumps now requested).
+    """
+    video_id = video_id_from_url(url)
+    if video_id is None:
+        return None
+    metadata_path = dataset_root / "videos" / video_id / "metadata.json"
+    try:
+        metadata = orjson.loads(metadata_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+    transcripts = metadata.get("transcripts") or {}
+    audio_path = metadata.get("audio_path")
+    if transcripts.get("error") is not None or not audio_path:
+        return None
+    # Metadata written before these fields existed is never treated as complete.
+    if "requested_auto_language" not in transcripts or transcripts["requested_auto_language"] != auto_language:
+        return None
+    if include_all_transcripts and not transcripts.get("include_all_transcripts"):
+        return None
+    # Compare the requested format, not the suffix: aac/alac land in .m4a and vorbis in .ogg.
+    if metadata.get("audio_format") != audio_format:
+        return None
+    if not (dataset_root / audio_path).is_file():
+        return None
+    return metadata, metadata_path
+
+
+# Shared by every URL and never mutated, so each process_url() call only allocates
+# the dicts that actually vary. (orjson cannot serialize a MappingProxyType.)
+_EMPTY_TRANSCRIPT_SUMMARY: dict[str, Any] = {
+    "default_path": None,
+    "auto_language_path": None,
+    "auto_language_mode": "missing",
+    "auto_language_code": None,
+    "available": (),
+}
+_DISABLED_SEGMENTS: dict[str, Any] = {
+    "enabled": False,
+    "segment_count": 0,
+    "skipped_count": 0,
+    "base_track": None,
+    "segment_format": None,
+    "segment_workers": None,
+    "ffmpeg_bin": None,
+    "index_path": None,
+    "segments_dir": None,
+    "error": None,
+}
+
+
 def process_url(
     url: str,
     dataset_root: Path,
@@ -280,6 +527,9 @@ def process_url(
     include_all_transcripts: bool,
     overwrite: bool,
     ffmpeg_bin: str,
+    info: dict[str, Any] | None = None,
+    downloader: Callable[[str, Path], Path] | None = None,
+    transcript_executor: Executor | None = None,
 ) -> dict[str, Any]:
     started_at = now_iso()
     record: dict[str, Any] = {
@@ -288,47 +538,111 @@ def process_url(
         "started_at": started_at,
     }
 
-    info = fetch_video_info(
-        url,
-        cookie_file=cookie_file,
-        cookies_from_browser=cookies_from_browser,
-    )
-    video_id = info["id"]
+    completed = None
+    if info is None and not overwrite:
+        completed = load_completed_metadata(
+            url,
+            dataset_root,
+            auto_language=auto_language,
+            audio_format=audio_format,
+            include_all_transcripts=include_all_transcripts,
+        )
+    if completed is not None:
+        metadata, metadata_path = completed
+        transcripts = metadata["transcripts"]
+        record.update(
+            {
+                "status": "success",
+                "video_id": metadata.get("video_id"),
+                "title": metadata.get("title"),
+                "duration_seconds": metadata.get("duration_seconds"),
+                "audio_path": metadata.get("audio_path"),
+                "default_transcript_path": transcripts.get("default_path"),
+                "auto_language": transcripts.get("auto_language"),
+                "auto_transcript_path": transcripts.get("auto_language_path"),
+                "auto_transcript_mode": transcripts.get("auto_language_mode"),
+                "segment_count": 0,
+                "segments_index_path": None,
+                "metadata_path": to_relative(metadata_path, dataset_root),
+                "error": None,
+                "finished_at": now_iso(),
+            }
+        )
+        return record
+
+    # Without prefetched info (and without an injected downloader) metadata and audio
+    # come from one fetch_and_download() extraction; the video id in the URL is
+    # enough to lay out directories and start transcripts before it.
+    video_id = info["id"] if info is not None else video_id_from_url(url)
+    if video_id is None or (info is None and downloader is not None):
+        info = fetch_video_info(
+            url,
+            cookie_file=cookie_file,
+            cookies_from_browser=cookies_from_browser,
+            info_cache_path=video_info_cache_path(dataset_root),
+            info_cache_ttl=0 if overwrite else VIDEO_INFO_CACHE_TTL_SECONDS,
+        )
+        video_id = info["id"]
     video_root = dataset_root / "videos" / video_id
     audio_dir = video_root / "audio"
     transcripts_dir = video_root / "transcripts"
     video_root.mkdir(parents=True, exist_ok=True)
 
-    audio_path = download_audio(
-        url,
-        audio_dir,
-        cookie_file=cookie_file,
-        cookies_from_browser=cookies_from_browser,
-        audio_format=audio_format,
-        audio_quality=audio_quality,
-        ffmpeg_bin=ffmpeg_bin,
-        overwrite=overwrite,
-    )
+    if downloader is None and info is not None:
+        downloader = make_downloader(
+            cookie_file=cookie_file,
+            cookies_from_browser=cookies_from_browser,
+            audio_format=audio_format,
+            audio_quality=audio_quality,
+            ffmpeg_bin=ffmpeg_bin,
+            overwrite=overwrite,
+        )
 
-    transcript_error = None
-    transcript_summary: dict[str, Any] = {
-        "default_path": None,
-        "auto_language_path": None,
-        "auto_language_mode": "missing",
-        "auto_language_code": None,
-        "available": [],
-    }
-    try:
-        transcript_summary = fetch_and_store_transcripts(
+    def fetch_transcripts() -> dict[str, Any]:
+        return fetch_and_store_transcripts(
             video_id,
             transcripts_dir,
             auto_language=auto_language,
             include_all_transcripts=include_all_transcripts,
             overwrite=overwrite,
         )
+
+    transcript_future = transcript_executor.submit(fetch_transcripts) if transcript_executor is not None else None
+    try:
+        if info is None:
+            info, audio_path = fetch_and_download(
+                url,
+                audio_dir,
+                cookie_file=cookie_file,
+                cookies_from_browser=cookies_from_browser,
+                audio_format=audio_format,
+                audio_quality=audio_quality,
+                ffmpeg_bin=ffmpeg_bin,
+                overwrite=overwrite,
+                info_cache_path=video_info_cache_path(dataset_root),
+            )
+            if info["id"] != video_id:
+                raise RuntimeError(f"URL resolved to video {info['id']}, expected {video_id}: {url}")
+        else:
+            audio_path = downloader(url, audio_dir)
+    except BaseException:
+        if transcript_future is not None:
+            transcript_future.cancel()
+        raise
+
+    transcript_error = None
+    transcript_summary: dict[str, Any] = _EMPTY_TRANSCRIPT_SUMMARY
+    try:
+        transcript_summary = transcript_future.result() if transcript_future is not None else fetch_transcripts()
     except Exception as exc:  # noqa: BLE001
         transcript_error = str(exc)
 
+    # metadata.created_at and record.finished_at describe the same instant.
+    finished_at = now_iso()
+    audio_rel_path = to_relative(audio_path, dataset_root)
+    default_transcript_rel_path = to_relative(transcript_summary.get("default_path"), dataset_root)
+    auto_transcript_rel_path = to_relative(transcript_summary.get("auto_language_path"), dataset_root)
+    resolved_auto_language = auto_language or transcript_summary.get("auto_language_code")
     metadata = {
         "video_id": video_id,
         "url": url,
@@ -338,12 +652,15 @@ def process_url(
         "duration_seconds": info.get("duration"),
         "upload_date": info.get("upload_date"),
         "language_hint": info.get("language"),
-        "audio_path": to_relative(audio_path, dataset_root),
+        "audio_path": audio_rel_path,
+        "audio_format": audio_format,
         "transcripts": {
-            "default_path": to_relative(transcript_summary.get("default_path"), dataset_root),
-            "auto_language": auto_language or transcript_summary.get("auto_language_code"),
+            "default_path": default_transcript_rel_path,
+            "auto_language": resolved_auto_language,
             "auto_language_mode": transcript_summary.get("auto_language_mode"),
-            "auto_language_path": to_relative(transcript_summary.get("auto_language_path"), dataset_root),
+            "auto_language_path": auto_transcript_rel_path,
+            "requested_auto_language": auto_language,
+            "include_all_transcripts": include_all_transcripts,
             "available": [
                 {
                     **item,
@@ -353,26 +670,15 @@ def process_url(
             ],
             "error": transcript_error,
         },
-        "segments": {
-            "enabled": False,
-            "segment_count": 0,
-            "skipped_count": 0,
-            "base_track": None,
-            "segment_format": None,
-            "segment_workers": None,
-            "ffmpeg_bin": None,
-            "index_path": None,
-            "segments_dir": None,
-            "error": None,
-        },
+        "segments": _DISABLED_SEGMENTS,
         "auth": {
             "cookie_file_provided": bool(cookie_file),
             "cookies_from_browser_provided": bool(cookies_from_browser),
         },
-        "created_at": now_iso(),
+        "created_at": finished_at,
     }
     metadata_path = video_root / "metadata.json"
-    metadata_path.write_text(json.dumps(metadata, ensure_ascii=False, indent=2), encoding="utf-8")
+    metadata_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
     record.update(
         {
@@ -380,16 +686,16 @@ def process_url(
             "video_id": video_id,
             "title": info.get("title"),
             "duration_seconds": info.get("duration"),
-            "audio_path": to_relative(audio_path, dataset_root),
-            "default_transcript_path": to_relative(transcript_summary.get("default_path"), dataset_root),
-            "auto_language": auto_language or transcript_summary.get("auto_language_code"),
-            "auto_transcript_path": to_relative(transcript_summary.get("auto_language_path"), dataset_root),
+            "audio_path": audio_rel_path,
+            "default_transcript_path": default_transcript_rel_path,
+            "auto_language": resolved_auto_language,
+            "auto_transcript_path": auto_transcript_rel_path,
             "auto_transcript_mode": transcript_summary.get("auto_language_mode"),
             "segment_count": 0,
             "segments_index_path": None,
             "metadata_path": to_relative(metadata_path, dataset_root),
             "error": transcript_error,
-            "finished_at": now_iso(),
+            "finished_at": finished_at,
         }
     )
     return record
@@ -407,10 +713,8 @@ def main() -> None:
         video_workers_arg=args.video_workers,
     )
 
-    dataset_root.mkdir(parents=True, exist_ok=True)
-    (dataset_root / "videos").mkdir(parents=True, exist_ok=True)
-    (dataset_root / "manifests").mkdir(parents=True, exist_ok=True)
-    (dataset_root / "links").mkdir(parents=True, exist_ok=True)
+    for directory in ("videos", "manifests", "links"):
+        ensure_dir(dataset_root / directory)
 
     if args.system != "auto" and runtime["system"] != runtime["detected_system"]:
         print(
@@ -432,60 +736,78 @@ def main() -> None:
         ),
     )
 
-    # Preserve the exact input list used for this run.
-    input_copy_path = dataset_root / "links" / f"input_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-    input_copy_path.write_text("\n".join(urls) + "\n", encoding="utf-8")
+    with ThreadPoolExecutor(max_workers=1) as manifest_writer:
+        # Preserve the exact input file used for this run. The copy runs on a background
+        # writer so a slow or networked disk does not delay the start of the batch.
+        input_copy_write = manifest_writer.submit(
+            copy_input_file, urls_file, dataset_root / "links", f"input_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        )
 
-    records = process_urls_batch(
-        urls,
-        dataset_root,
-        auto_language=args.auto_language,
-        cookie_file=cookie_file,
-        cookies_from_browser=cookies_from_browser,
-        audio_format=args.audio_format,
-        audio_quality=args.audio_quality,
-        include_all_transcripts=not args.skip_all_transcripts,
-        overwrite=args.overwrite,
-        ffmpeg_bin=args.ffmpeg_bin,
-        video_workers=runtime["video_workers"],
-        label="video",
-    )
+        records_path = dataset_root / "manifests" / "records.jsonl"
+        failures_path = dataset_root / "manifests" / "failures.jsonl"
+        csv_path = dataset_root / "manifests" / "records.csv"
+        summary_path = dataset_root / "manifests" / "summary.json"
+
+        # Records are appended as each video finishes rather than held until the end.
+        status_counts: Counter[str] = Counter()
+        with records_path.open("wb") as records_file, failures_path.open("wb") as failures_file:
+
+            def on_record(record: dict[str, Any]) -> None:
+                status = record.get("status")
+                status_counts[status] += 1
+                line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+                records_file.write(line)
+                if status in {"failed", "partial"}:
+                    failures_file.write(line)
+
+            process_urls_batch(
+                urls,
+                dataset_root,
+                auto_language=args.auto_language,
+                cookie_file=cookie_file,
+                cookies_from_browser=cookies_from_browser,
+                audio_format=args.audio_format,
+                audio_quality=args.audio_quality,
+                include_all_transcripts=not args.skip_all_transcripts,
+                overwrite=args.overwrite,
+                ffmpeg_bin=args.ffmpeg_bin,
+                video_workers=runtime["video_workers"],
+                label="video",
+                on_record=on_record,
+            )
 
-    records_path = dataset_root / "manifests" / "records.jsonl"
-    failures_path = dataset_root / "manifests" / "failures.jsonl"
-    csv_path = dataset_root / "manifests" / "records.csv"
-    summary_path = dataset_root / "manifests" / "summary.json"
-
-    failed_records = [row for row in records if row.get("status") in {"failed", "partial"}]
-    success_count = len([row for row in records if row.get("status") == "success"])
-    partial_count = len([row for row in records if row.get("status") == "partial"])
-    failed_count = len([row for row in records if row.get("status") == "failed"])
-
-    write_jsonl(records_path, records)
-    write_jsonl(failures_path, failed_records)
-    write_csv(csv_path, records)
-    summary = {
-        "created_at": now_iso(),
-        "dataset_root": str(dataset_root),
-        "system": runtime["system"],
-        "detected_system": runtime["detected_system"],
-        "cpu_count": runtime["cpu_count"],
-        "video_workers": runtime["video_workers"],
-        "ffmpeg_bin": args.ffmpeg_bin,
-        "cookie_file_provided": bool(cookie_file),
-        "cookies_from_browser_provided": bool(cookies_from_browser),
-        "total_urls": len(records),
-        "success_count": success_count,
-        "partial_count": partial_count,
-        "failed_count": failed_count,
-        "records_path": str(records_path),
-        "failures_path": str(failures_path),
-        "csv_path": str(csv_path),
-    }
-    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        # The CSV conversion re-reads records.jsonl in the background while the summary
+        # is built and written here.
+        csv_write = manifest_writer.submit(write_csv_from_jsonl, csv_path, records_path)
+
+        success_count = status_counts["success"]
+        partial_count = status_counts["partial"]
+        failed_count = status_counts["failed"]
+        summary = {
+            "created_at": now_iso(),
+            "dataset_root": str(dataset_root),
+            "system": runtime["system"],
+            "detected_system": runtime["detected_system"],
+            "cpu_count": runtime["cpu_count"],
+            "video_workers": runtime["video_workers"],
+            "ffmpeg_bin": args.ffmpeg_bin,
+            "cookie_file_provided": bool(cookie_file),
+            "cookies_from_browser_provided": bool(cookies_from_browser),
+            "total_urls": sum(status_counts.values()),
+            "success_count": success_count,
+            "partial_count": partial_count,
+            "failed_count": failed_count,
+            "records_path": str(records_path),
+            "failures_path": str(failures_path),
+            "csv_path": str(csv_path),
+        }
+        summary_bytes = orjson.dumps(summary, option=orjson.OPT_INDENT_2)
+        summary_path.write_bytes(summary_bytes)
+        input_copy_write.result()
+        csv_write.result()
 
     print("\nRun complete")
-    print(json.dumps(summary, indent=2))
+    print(summary_bytes.decode("utf-8"))
 
 
 if __name__ == "__main__":
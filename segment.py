@@ -1,51 +1,86 @@
 from __future__ import annotations
 
-import json
+import atexit
+import hashlib
+import os
 import re
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import accumulate
 from pathlib import Path
 from typing import Any
 
+import orjson
+
+
+_SAFE_KEY_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
 
 def _safe_track_key(value: str) -> str:
-    key = re.sub(r"[^A-Za-z0-9_.-]+", "_", value.strip())
-    return key.strip("_") or "track"
+    return _SAFE_KEY_RE.sub("_", value.strip()).strip("_") or "track"
 
 
-def _load_entries(path: Path) -> list[dict[str, Any]]:
-    data = json.loads(path.read_text(encoding="utf-8"))
+# Per-track entries as parallel columns (starts, durations, ends, texts). The
+# float columns are packed array('d') buffers rather than one boxed tuple per
+# caption, which keeps large tracks compact and the window scans cache-friendly.
+_TrackEntries = tuple[array, array, array, list[str]]
+
+
+def _parse_entries(raw: bytes) -> _TrackEntries:
+    starts, durations, ends, texts = array("d"), array("d"), array("d"), []
+    # Parse the raw bytes directly: no intermediate decoded str copy of a multi-hour transcript.
+    data = orjson.loads(raw)
     if not isinstance(data, list):
-        return []
-    entries: list[dict[str, Any]] = []
+        return starts, durations, ends, texts
     for entry in data:
         if not isinstance(entry, dict):
             continue
-        text = str(entry.get("text", "")).strip()
         start = float(entry.get("start", 0.0))
         duration = float(entry.get("duration", 0.0))
         if duration < 0:
             duration = 0.0
-        entries.append({"text": text, "start": start, "duration": duration})
-    return entries
+        starts.append(start)
+        durations.append(duration)
+        ends.append(start + duration)
+        # Captions repeat lines (music cues, speaker tags); interning shares those strings.
+        texts.append(sys.intern(str(entry.get("text", "")).strip()))
+    return starts, durations, ends, texts
+
+
+def _window_index(entries: _TrackEntries) -> tuple[list[float], list[int], list[float]]:
+    """Return (sorted starts, entry indices in that order, running max of their ends) for _collect_text_in_window."""
+    starts, _, ends, _ = entries
+    order = sorted(range(len(starts)), key=starts.__getitem__)
+    return [starts[idx] for idx in order], order, list(accumulate((ends[idx] for idx in order), max))
 
 
 def _collect_text_in_window(
-    entries: list[dict[str, Any]], start: float, end: float
+    entries: _TrackEntries,
+    start: float,
+    end: float,
+    window_index: tuple[list[float], list[int], list[float]],
 ) -> tuple[str, list[int]]:
-    texts: list[str] = []
+    # Both bounds are exact bisects (C loops, no per-entry Python work): entries
+    # before `lo` all end by `start` because even their running max end does, and
+    # entries from `hi` on start at or after `end`. One long caption therefore no
+    # longer widens the scan for every window.
+    sorted_starts, order, running_max_ends = window_index
+    lo = bisect_right(running_max_ends, start)
+    hi = bisect_left(sorted_starts, end)
+    starts, _, ends, texts = entries
+    texts_in_window: list[str] = []
     matched_indices: list[int] = []
-    for idx, entry in enumerate(entries):
-        entry_start = float(entry["start"])
-        entry_end = entry_start + float(entry["duration"])
-        if entry_end <= start or entry_start >= end:
-            continue
-        text = str(entry["text"]).strip()
-        if not text:
+    for idx in sorted(order[lo:hi]):
+        # _parse_entries already stripped the text and converted the times to float.
+        if ends[idx] <= start or starts[idx] >= end or not texts[idx]:
             continue
-        texts.append(text)
+        texts_in_window.append(texts[idx])
         matched_indices.append(idx)
-    return " ".join(texts).strip(), matched_indices
+    return " ".join(texts_in_window), matched_indices
 
 
 def _codec_args(audio_format: str, bitrate: str) -> list[str]:
@@ -63,17 +98,115 @@ def _codec_args(audio_format: str, bitrate: str) -> list[str]:
     return []
 
 
-def _run_ffmpeg_cut(
+# Source codecs that can be remuxed as-is into each segment format instead of re-encoded.
+_COPYABLE_CODECS = {
+    "mp3": {"mp3"},
+    "m4a": {"aac"},
+    "aac": {"aac"},
+    "flac": {"flac"},
+    "opus": {"opus"},
+    "wav": {"pcm_s16le"},
+    "wave": {"pcm_s16le"},
+}
+# Lossless targets take no bitrate, so a matching source is always copied.
+_LOSSLESS_FORMATS = {"flac", "wav", "wave"}
+_BITRATE_RE = re.compile(r"(\d+(?:\.\d+)?)([kKmM]?)")
+
+
+def _parse_bitrate(value: str) -> int | None:
+    match = _BITRATE_RE.fullmatch(value.strip())
+    if match is None:
+        return None
+    number, unit = match.groups()
+    return int(float(number) * {"": 1, "k": 1000, "m": 1000000}[unit.lower()])
+
+
+def _probe_audio_stream(source_audio: Path, ffmpeg_bin: str) -> tuple[str | None, int | None]:
+    """Return (codec name, bit rate) of the first audio stream; None for whatever ffprobe cannot report."""
+    ffmpeg_path = Path(ffmpeg_bin)
+    ffprobe_bin = str(ffmpeg_path.with_name(ffmpeg_path.name.replace("ffmpeg", "ffprobe")))
+    command = [
+        ffprobe_bin,
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "stream=codec_name,bit_rate",
+        "-of",
+        "default=noprint_wrappers=1",
+        str(source_audio),
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+    except OSError:
+        return None, None
+    if result.returncode != 0:
+        return None, None
+    fields = dict(line.split("=", 1) for line in result.stdout.splitlines() if "=" in line)
+    bit_rate = fields.get("bit_rate", "")
+    return fields.get("codec_name") or None, int(bit_rate) if bit_rate.isdigit() else None
+
+
+def _segment_codec_args(source_audio: Path, audio_format: str, bitrate: str, ffmpeg_bin: str) -> list[str]:
+    """
+    Return stream-copy args when the source can be remuxed as-is, else the encode args.
+
+    A lossy source is copied only when its bit rate is known and does not exceed the
+    requested bitrate, so the copy never yields larger segments than an encode would.
+    """
+    fmt = audio_format.lower()
+    copyable = _COPYABLE_CODECS.get(fmt)
+    if copyable:
+        codec, source_bit_rate = _probe_audio_stream(source_audio, ffmpeg_bin)
+        if codec in copyable:
+            requested_bit_rate = _parse_bitrate(bitrate)
+            if fmt in _LOSSLESS_FORMATS or (
+                source_bit_rate is not None
+                and requested_bit_rate is not None
+                and source_bit_rate <= requested_bit_rate
+            ):
+                return ["-c:a", "copy", "-avoid_negative_ts", "make_zero"]
+    return _codec_args(audio_format, bitrate)
+
+
+# Upper bound on outputs per ffmpeg command: keeps the argv well below ARG_MAX and
+# the open output files below the usual 1024 descriptor limit.
+_MAX_CUTS_PER_FFMPEG = 256
+# A silence longer than this between consecutive cuts starts a new batch: seeking
+# over the gap is cheaper than decoding through it inside one ffmpeg run.
+_MAX_BATCH_GAP_SECONDS = 30.0
+
+
+def _batch_cuts(cuts: list[tuple[float, float, Path]], batch_size: int) -> list[list[tuple[float, float, Path]]]:
+    """Group start-sorted cuts into runs of at most batch_size that contain no long gap."""
+    batches: list[list[tuple[float, float, Path]]] = []
+    batch: list[tuple[float, float, Path]] = []
+    batch_end = 0.0
+    for cut in cuts:
+        start, duration, _ = cut
+        if batch and (len(batch) >= batch_size or start - batch_end > _MAX_BATCH_GAP_SECONDS):
+            batches.append(batch)
+            batch = []
+        batch_end = max(batch_end, start + duration) if batch else start + duration
+        batch.append(cut)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _run_ffmpeg_cuts(
     source_audio: Path,
-    output_audio: Path,
+    cuts: list[tuple[float, float, Path]],
     *,
-    start: float,
-    duration: float,
-    audio_format: str,
-    bitrate: str,
+    codec_args: list[str],
     ffmpeg_bin: str,
 ) -> None:
-    output_audio.parent.mkdir(parents=True, exist_ok=True)
+    """Write every (start, duration, output_audio) cut with one ffmpeg process and one decode pass."""
+    # Seek the input to the earliest cut (demuxer-level, no decoding of the skipped
+    # part); each output then only trims the remaining offset. Input seeking resets
+    # timestamps, so the per-output -ss is relative to seek_to.
+    seek_to = min(start for start, _, _ in cuts)
     command = [
         ffmpeg_bin,
         "-hide_banner",
@@ -83,16 +216,54 @@ def _run_ffmpeg_cut(
         "-threads",
         "1",
         "-ss",
-        f"{start:.3f}",
-        "-t",
-        f"{duration:.3f}",
+        f"{seek_to:.3f}",
         "-i",
         str(source_audio),
-        "-vn",
-        *_codec_args(audio_format, bitrate),
-        str(output_audio),
     ]
-    subprocess.run(command, check=True)
+    # ffmpeg writes to temporary names and the cuts are published only after it exits
+    # cleanly, so an interrupted run never leaves a partial file that a later
+    # overwrite=False run would accept. The temp names keep the extension ffmpeg
+    # picks the muxer from.
+    temp_paths = [
+        output_audio.with_name(f"{output_audio.stem}.{os.getpid()}.{threading.get_ident()}.tmp{output_audio.suffix}")
+        for _, _, output_audio in cuts
+    ]
+    for (start, duration, _), temp_path in zip(cuts, temp_paths):
+        command += ["-ss", f"{start - seek_to:.3f}", "-t", f"{duration:.3f}", "-vn", *codec_args, str(temp_path)]
+    try:
+        subprocess.run(command, check=True)
+        for (_, _, output_audio), temp_path in zip(cuts, temp_paths):
+            os.replace(temp_path, output_audio)
+    except BaseException:
+        for temp_path in temp_paths:
+            temp_path.unlink(missing_ok=True)
+        raise
+
+
+_EXECUTORS: dict[int, ThreadPoolExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _segment_executor(workers: int) -> ThreadPoolExecutor:
+    """Return the process-wide pool for this worker count, so batch runs do not rebuild it per video."""
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(workers)
+        if executor is None:
+            executor = _EXECUTORS[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"segment-{workers}"
+            )
+        return executor
+
+
+def _shutdown_segment_executors() -> None:
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+atexit.register(_shutdown_segment_executors)
 
 
 def _collect_transcript_tracks(transcript_summary: dict[str, Any]) -> dict[str, dict[str, Any]]:
@@ -138,11 +309,21 @@ def _collect_transcript_tracks(transcript_summary: dict[str, Any]) -> dict[str,
     return tracks
 
 
+def _write_file_atomic(path: Path, payload: bytes) -> None:
+    # Existing bundles are trusted on re-runs, so they must never be visible half-written.
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temp_path.write_bytes(payload)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
 def _write_jsonl(path: Path, rows: list[dict[str, Any]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    # One write for the whole index instead of a buffered write call per row.
+    path.write_bytes(b"".join([orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows]))
 
 
 def create_transcript_aligned_segments(
@@ -178,54 +359,83 @@ def create_transcript_aligned_segments(
         }
 
     output_root.mkdir(parents=True, exist_ok=True)
-    entries_by_track = {track_key: _load_entries(track_data["path"]) for track_key, track_data in tracks.items()}
+    # Tracks with identical content share one entries object (and one window index),
+    # which also lets the segment loop reuse a window result across them. caption.py
+    # writes default.json / auto_*.json as byte copies of a per-language file, so the
+    # dedup is by content hash, after a cheaper dedup by resolved path.
+    entries_by_path: dict[Path, _TrackEntries] = {}
+    entries_by_digest: dict[bytes, _TrackEntries] = {}
+    entries_by_track: dict[str, _TrackEntries] = {}
+    for track_key, track_data in tracks.items():
+        track_path = track_data["path"].resolve()
+        track_entries = entries_by_path.get(track_path)
+        if track_entries is None:
+            raw = track_path.read_bytes()
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            track_entries = entries_by_digest.get(digest)
+            if track_entries is None:
+                track_entries = entries_by_digest[digest] = _parse_entries(raw)
+            entries_by_path[track_path] = track_entries
+        entries_by_track[track_key] = track_entries
 
     base_track = "default" if "default" in entries_by_track else next(iter(entries_by_track.keys()))
     base_entries = entries_by_track[base_track]
+    window_indexes = {id(track_entries): _window_index(track_entries) for track_entries in entries_by_digest.values()}
 
     if workers < 1:
         raise ValueError("workers must be >= 1")
 
-    prepared_segments: list[dict[str, Any]] = []
-    skipped_count = 0
-    kept_index = 0
-    for base_entry_index, entry in enumerate(base_entries):
-        text = str(entry["text"]).strip()
-        start = max(0.0, float(entry["start"]))
-        duration = float(entry["duration"])
-        if duration < min_duration or len(text) < min_chars:
-            skipped_count += 1
-            continue
+    base_starts, base_durations, _, base_texts = base_entries
+    # Filter the base entries in one pass up front; the loop below only visits kept ones.
+    kept_entry_indices = [
+        idx
+        for idx, (duration, text) in enumerate(zip(base_durations, base_texts))
+        if duration >= min_duration and len(text) >= min_chars
+    ]
+    skipped_count = len(base_texts) - len(kept_entry_indices)
 
+    prepared_segments: list[dict[str, Any]] = []
+    for kept_index, base_entry_index in enumerate(kept_entry_indices):
+        start = max(0.0, base_starts[base_entry_index])
+        duration = base_durations[base_entry_index]
+        text = base_texts[base_entry_index]
         segment_id = f"{kept_index:06d}"
-        kept_index += 1
         end = start + duration
         segment_dir = output_root / segment_id
         audio_path = segment_dir / f"audio.{segment_audio_format}"
         transcript_bundle_path = segment_dir / "transcripts.json"
 
-        tracks_bundle: dict[str, Any] = {}
-        for track_key, track_entries in entries_by_track.items():
-            track_text, matched_indices = _collect_text_in_window(track_entries, start, end)
-            track_meta = tracks[track_key]
-            tracks_bundle[track_key] = {
-                "text": track_text,
-                "entry_indices": matched_indices,
-                "language_code": track_meta["language_code"],
-                "is_generated": track_meta["is_generated"],
+        # On re-runs an existing bundle is kept, so skip the windowing that would rebuild it.
+        bundle: dict[str, Any] | None = None
+        if overwrite or not transcript_bundle_path.exists():
+            tracks_bundle: dict[str, Any] = {}
+            windows: dict[int, tuple[str, list[int]]] = {}
+            for track_key, track_entries in entries_by_track.items():
+                window = windows.get(id(track_entries))
+                if window is None:
+                    window = windows[id(track_entries)] = _collect_text_in_window(
+                        track_entries, start, end, window_indexes[id(track_entries)]
+                    )
+                track_text, matched_indices = window
+                track_meta = tracks[track_key]
+                tracks_bundle[track_key] = {
+                    "text": track_text,
+                    "entry_indices": matched_indices,
+                    "language_code": track_meta["language_code"],
+                    "is_generated": track_meta["is_generated"],
+                }
+
+            bundle = {
+                "segment_id": segment_id,
+                "timing": {
+                    "start": start,
+                    "duration": duration,
+                    "end": end,
+                    "base_track": base_track,
+                    "base_entry_index": base_entry_index,
+                },
+                "tracks": tracks_bundle,
             }
-
-        bundle = {
-            "segment_id": segment_id,
-            "timing": {
-                "start": start,
-                "duration": duration,
-                "end": end,
-                "base_track": base_track,
-                "base_entry_index": base_entry_index,
-            },
-            "tracks": tracks_bundle,
-        }
         prepared_segments.append(
             {
                 "start": start,
@@ -246,30 +456,52 @@ def create_transcript_aligned_segments(
             }
         )
 
-    def materialize_segment(item: dict[str, Any]) -> None:
-        audio_path = item["audio_path"]
-        transcript_bundle_path = item["transcript_bundle_path"]
-        if overwrite or not audio_path.exists():
-            _run_ffmpeg_cut(
-                source_audio_path,
-                audio_path,
-                start=float(item["start"]),
-                duration=float(item["duration"]),
-                audio_format=segment_audio_format,
-                bitrate=segment_audio_bitrate,
-                ffmpeg_bin=ffmpeg_bin,
-            )
-        transcript_bundle_path.parent.mkdir(parents=True, exist_ok=True)
-        transcript_bundle_path.write_text(json.dumps(item["bundle"], ensure_ascii=False, indent=2), encoding="utf-8")
+    # Segment directories are created once here, before any cut or bundle needs them.
+    for item in prepared_segments:
+        item["transcript_bundle_path"].parent.mkdir(exist_ok=True)
+
+    pending_cuts = [
+        (float(item["start"]), float(item["duration"]), item["audio_path"])
+        for item in prepared_segments
+        if overwrite or not item["audio_path"].exists()
+    ]
+    # Cut in batches so each ffmpeg process opens and decodes the source once for many
+    # segments; with several workers the cuts are spread evenly across them. Sorting
+    # by start gives every batch a contiguous time range, so after its input seek a
+    # batch decodes only its own stretch and the batches together cover the source
+    # about once.
+    pending_cuts.sort(key=lambda cut: cut[0])
+    batch_size = max(1, min(_MAX_CUTS_PER_FFMPEG, -(-len(pending_cuts) // workers)))
+    batches = _batch_cuts(pending_cuts, batch_size)
+
+    # Probe once per source: when its codec already matches the segment format the
+    # cuts are remuxed instead of transcoded.
+    codec_args = (
+        _segment_codec_args(source_audio_path, segment_audio_format, segment_audio_bitrate, ffmpeg_bin)
+        if pending_cuts
+        else []
+    )
+
+    def cut_batch(batch: list[tuple[float, float, Path]]) -> None:
+        _run_ffmpeg_cuts(source_audio_path, batch, codec_args=codec_args, ffmpeg_bin=ffmpeg_bin)
+
+    def write_bundle(item: dict[str, Any]) -> None:
+        _write_file_atomic(item["transcript_bundle_path"], orjson.dumps(item["bundle"], option=orjson.OPT_INDENT_2))
 
-    if workers == 1:
+    # ffmpeg runs in child processes and the pool threads only wait on them, so the
+    # GIL-bound bundle serialization happens here while the cuts are in progress.
+    futures = [_segment_executor(workers).submit(cut_batch, batch) for batch in batches]
+    try:
         for item in prepared_segments:
-            materialize_segment(item)
-    else:
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            futures = [executor.submit(materialize_segment, item) for item in prepared_segments]
-            for future in as_completed(futures):
-                future.result()
+            if item["bundle"] is not None:
+                write_bundle(item)
+    finally:
+        # Let every batch finish before anything propagates, so no ffmpeg is still
+        # writing into the segments directory once this function returns. Results are
+        # only checked on success so a cut failure never masks a bundle write error.
+        wait(futures)
+    for future in futures:
+        future.result()
 
     index_path = output_root / "index.jsonl"
     rows = [item["row"] for item in prepared_segments]
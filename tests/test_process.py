@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import orjson
+
+from process import load_completed_metadata
+
+VIDEO_ID = "dQw4w9WgXcQ"
+URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+def _write_completed_run(dataset_root: Path, audio_format: str, audio_name: str) -> None:
+    video_root = dataset_root / "videos" / VIDEO_ID
+    (video_root / "audio").mkdir(parents=True)
+    (video_root / "audio" / audio_name).write_bytes(b"audio")
+    metadata = {
+        "video_id": VIDEO_ID,
+        "url": URL,
+        "audio_path": f"videos/{VIDEO_ID}/audio/{audio_name}",
+        "audio_format": audio_format,
+        "transcripts": {
+            "requested_auto_language": None,
+            "include_all_transcripts": True,
+            "error": None,
+        },
+    }
+    (video_root / "metadata.json").write_bytes(orjson.dumps(metadata))
+
+
+def _load(dataset_root: Path, audio_format: str):
+    return load_completed_metadata(
+        URL,
+        dataset_root,
+        auto_language=None,
+        audio_format=audio_format,
+        include_all_transcripts=True,
+    )
+
+
+def test_aac_run_stored_as_m4a_is_short_circuited(tmp_path: Path) -> None:
+    _write_completed_run(tmp_path, "aac", f"{VIDEO_ID}.m4a")
+
+    completed = _load(tmp_path, "aac")
+
+    assert completed is not None
+    metadata, metadata_path = completed
+    assert metadata["audio_format"] == "aac"
+    assert metadata_path == tmp_path / "videos" / VIDEO_ID / "metadata.json"
+
+
+def test_different_audio_format_is_processed_again(tmp_path: Path) -> None:
+    _write_completed_run(tmp_path, "aac", f"{VIDEO_ID}.m4a")
+
+    assert _load(tmp_path, "m4a") is None
+    assert _load(tmp_path, "best") is None